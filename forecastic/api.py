@@ -13,10 +13,14 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import functools
-import json
+import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from importlib import resources
 from typing import Any, List, Optional, Tuple
 from urllib.parse import urljoin
@@ -24,16 +28,48 @@ from urllib.parse import urljoin
 import datarobot as dr
 import pandas as pd
 import plotly.graph_objects as go
+import pyarrow as pa
 import yaml
 from datarobot.errors import ClientError
-from datarobot_predict.deployment import predict
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from plotly.subplots import make_subplots
 from pydantic import ValidationError
 
 sys.path.append("..")
 
+from forecastic.cache import (
+    CacheSettings,
+    DatasetDiskCache,
+    LRUCache,
+    PredictionStore,
+    RefreshingCache,
+    SingleFlight,
+    TTLCache,
+)
+from forecastic.datasets import download_dataset_frame, download_dataset_table
+from forecastic.forecast_store import (
+    ForecastStore,
+    ForecastStoreSettings,
+    load_forecast_store,
+)
+from forecastic.frames import (
+    compact_frame,
+    get_forecast_point,
+    hash_series,
+    parse_datetime_column,
+    window_dates,
+)
 from forecastic.i18n import gettext
+from forecastic.index import FilterHierarchy, RollupCube, SeriesIndex
+from forecastic.predictions import (
+    PredictionSettings,
+    UploadStats,
+    get_async_http_client,
+    predict,
+    predict_async,
+    predict_in_shards,
+    predict_in_shards_async,
+)
 from forecastic.resources import (
     Application,
     GenerativeDeployment,
@@ -48,6 +84,7 @@ from forecastic.schema import (
     FilterSpec,
     ForecastSummary,
     MultiSelectFilter,
+    PredictionFrame,
     PredictionRow,
 )
 
@@ -74,6 +111,25 @@ except (FileNotFoundError, ValidationError) as e:
         )
     ) from e
 
+logger = logging.getLogger(__name__)
+
+# Prediction explanations requested per prediction row
+MAX_EXPLANATIONS = 3
+
+cache_settings = CacheSettings()
+prediction_settings = PredictionSettings()
+# Shared by all requests, bounding the prediction requests in flight per worker
+prediction_executor = ThreadPoolExecutor(
+    max_workers=prediction_settings.max_workers,
+    thread_name_prefix="forecastic-predict",
+)
+prediction_upload_stats = UploadStats()
+dataset_disk_cache = (
+    DatasetDiskCache(cache_settings.cache_dir)
+    if cache_settings.disk_cache_enabled
+    else None
+)
+
 
 class LLMNotAvailableException(Exception):
     """Exception raised when the LLM is unavailable."""
@@ -86,23 +142,34 @@ def _get_completion(
     llm_model_name: Optional[str] = None,
 ) -> str:
     """Generate LLM completion."""
-    generative_deployment_id = GenerativeDeployment().id
     try:
-        dr_client = dr.client.get_client()
-        azure_client = OpenAI(
-            base_url=dr_client.endpoint.rstrip("/")
-            + f"/deployments/{generative_deployment_id}",
-            api_key=dr_client.token,
-        )
-        if system_prompt:
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ]
-        else:
-            messages = [{"role": "user", "content": prompt}]
+        base_url, api_key = _get_llm_endpoint()
+        azure_client = OpenAI(base_url=base_url, api_key=api_key)
         resp = azure_client.chat.completions.create(
-            messages=messages,  # type: ignore[arg-type]
+            messages=_get_llm_messages(prompt, system_prompt),  # type: ignore[arg-type]
+            model="datarobot-deployed-llm",
+            temperature=temperature,
+        )
+        return str(resp.choices[0].message.content)
+    except Exception as e:
+        raise LLMNotAvailableException("LLM is unavailable.") from e
+
+
+async def _get_completion_async(
+    prompt: str,
+    temperature: float = 0,
+    system_prompt: Optional[str] = None,
+) -> str:
+    """Generate LLM completion over the pooled async HTTP client."""
+    try:
+        base_url, api_key = _get_llm_endpoint()
+        azure_client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=get_async_http_client(prediction_settings),
+        )
+        resp = await azure_client.chat.completions.create(
+            messages=_get_llm_messages(prompt, system_prompt),  # type: ignore[arg-type]
             model="datarobot-deployed-llm",
             temperature=temperature,
         )
@@ -111,6 +178,28 @@ def _get_completion(
         raise LLMNotAvailableException("LLM is unavailable.") from e
 
 
+def _get_llm_endpoint() -> Tuple[str, str]:
+    """Base URL and API key of the generative deployment."""
+    generative_deployment_id = GenerativeDeployment().id
+    dr_client = dr.client.get_client()
+    return (
+        dr_client.endpoint.rstrip("/") + f"/deployments/{generative_deployment_id}",
+        dr_client.token,
+    )
+
+
+def _get_llm_messages(
+    prompt: str, system_prompt: Optional[str]
+) -> list[dict[str, str]]:
+    """Chat messages of a completion request."""
+    if system_prompt:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+    return [{"role": "user", "content": prompt}]
+
+
 def get_app_settings() -> AppSettings:
     return app_settings
 
@@ -160,14 +249,198 @@ def get_runtime_attributes() -> AppRuntimeAttributes:
     )
 
 
-@functools.lru_cache(maxsize=16)
+async def get_runtime_attributes_async() -> AppRuntimeAttributes:
+    """Async variant of `get_runtime_attributes`."""
+    return await asyncio.to_thread(get_runtime_attributes)
+
+
+@dataclass(frozen=True)
+class ScoringDataSnapshot:
+    """One loaded version of the scoring data and the structures derived from it."""
+
+    frame: pd.DataFrame
+    series_index: SeriesIndex
+    filter_hierarchy: FilterHierarchy
+    timestamps: pd.Series
+    memory_report: pd.DataFrame
+    # Content hash of every series' rows, to tell which series a new version changed
+    series_fingerprints: pd.Series
+    version_id: str
+
+
+def _load_scoring_data(
+    loaded_version_id: Optional[str],
+) -> Optional[Tuple[str, ScoringDataSnapshot]]:
+    """
+    Load the latest scoring dataset version unless it is already loaded.
+
+    The latest dataset version is read from the local disk cache when present and
+    only streamed from DataRobot (and then cached) when it is not.
+    """
+    dataset = dr.Dataset.get(scoring_dataset_id)
+    if dataset.version_id == loaded_version_id:
+        return None
+    df = None
+    if dataset_disk_cache is not None:
+        df = dataset_disk_cache.load(dataset.id, dataset.version_id)
+    if df is None:
+        table = _download_scoring_data(dataset)
+        if dataset_disk_cache is not None:
+            dataset_disk_cache.store(dataset.id, dataset.version_id, table)
+        df = table.to_pandas()
+    series_columns = [
+        category.column_name for category in app_settings.filterable_categories
+    ] + [app_settings.multiseries_id_column]
+    df, memory_report = compact_frame(
+        df, series_columns + [app_settings.datetime_partition_column]
+    )
+    timestamps = parse_datetime_column(
+        df[app_settings.datetime_partition_column], app_settings.date_format
+    )
+    snapshot = ScoringDataSnapshot(
+        frame=df,
+        series_index=SeriesIndex.from_frame(df, series_columns),
+        filter_hierarchy=FilterHierarchy.from_frame(
+            df,
+            [category.column_name for category in app_settings.filterable_categories],
+        ),
+        timestamps=timestamps,
+        memory_report=memory_report,
+        series_fingerprints=_get_series_fingerprints(df, timestamps),
+        version_id=dataset.version_id,
+    )
+    return dataset.version_id, snapshot
+
+
+def _get_series_fingerprints(df: pd.DataFrame, timestamps: pd.Series) -> pd.Series:
+    """
+    Content hash of the rows of every series that its predictions use.
+
+    Covers the same rows and forecast point as the series' prediction cache
+    keys, so a new version changes a series' fingerprint exactly when it
+    changes what the series is predicted from.
+    """
+    series_id = app_settings.multiseries_id_column
+    if app_settings.target not in df.columns:
+        return hash_series(df, series_id)
+    window, forecast_point = _get_prediction_window(df, timestamps)
+    return hash_series(
+        window, series_id, salt=forecast_point.isoformat() if forecast_point else ""
+    )
+
+
+def _on_scoring_data_replaced(
+    previous: ScoringDataSnapshot, snapshot: ScoringDataSnapshot
+) -> None:
+    """Re-forecast the changed series of a newly installed scoring data version."""
+    threading.Thread(
+        target=_reforecast_changed_series,
+        args=(previous, snapshot),
+        name="forecastic-reforecast",
+        daemon=True,
+    ).start()
+
+
+def _find_changed_series(
+    previous: ScoringDataSnapshot, snapshot: ScoringDataSnapshot
+) -> pd.Index:
+    """Series of a new scoring data version that are new or whose rows changed."""
+    fingerprints = snapshot.series_fingerprints
+    previous_fingerprints = previous.series_fingerprints.reindex(fingerprints.index)
+    return fingerprints.index[(fingerprints != previous_fingerprints).to_numpy()]
+
+
+def _reforecast_changed_series(
+    previous: ScoringDataSnapshot, snapshot: ScoringDataSnapshot
+) -> None:
+    """
+    Predict the series a new scoring data version changed ahead of requests.
+
+    Cached forecasts of unchanged series stay valid for the new version, as
+    they are keyed by the content of each series' rows. Of the changed series,
+    only those with a cached forecast for the previous version are predicted
+    again, with or without explanations as they were cached.
+    """
+    changed = _find_changed_series(previous, snapshot)
+    logger.info(
+        "New scoring data version changed %d of %d series",
+        len(changed),
+        len(snapshot.series_fingerprints),
+    )
+    if len(changed) == 0 or not prediction_settings.reforecast_changed_series:
+        return
+    try:
+        previous_records, forecast_point = _trim_to_prediction_window(
+            _get_series_records(previous.frame, changed)
+        )
+        previous_df = pd.DataFrame(previous_records)
+        if app_settings.multiseries_id_column not in previous_df.columns:
+            return
+        model_id = _get_model_id(_get_deployment())
+        for explanations in (False, True):
+            max_explanations = MAX_EXPLANATIONS if explanations else 0
+            previous_keys = _get_series_keys(
+                previous_df, model_id, max_explanations, forecast_point
+            )
+            cached = _get_cached_predictions(previous_keys)
+            series = previous_keys.index[previous_keys.isin(list(cached))]
+            if len(series) > 0:
+                logger.info("Re-forecasting %d changed series", len(series))
+                get_predictions(
+                    _get_series_records(snapshot.frame, series), explanations
+                )
+    except Exception:
+        # Changed series are predicted on request instead
+        logger.warning("Unable to re-forecast changed series", exc_info=True)
+
+
+def _get_series_records(df: pd.DataFrame, series: pd.Index) -> list[dict[str, Any]]:
+    """Scoring records of the given series, as `get_scoring_data` returns them."""
+    rows = df[df[app_settings.multiseries_id_column].isin(series)]
+    return rows.to_dict(orient="records")  # type: ignore[no-any-return]
+
+
+def _download_scoring_data(dataset: dr.Dataset) -> pa.Table:
+    """Stream the scoring dataset from DataRobot into an Arrow table."""
+    try:
+        return download_dataset_table(
+            dataset, string_columns=[app_settings.datetime_partition_column]
+        )
+    except pa.ArrowInvalid:
+        # Column types inferred from the first block did not fit a later block
+        return pa.Table.from_pandas(
+            download_dataset_frame(dataset), preserve_index=False
+        )
+
+
+scoring_data_cache = RefreshingCache(
+    _load_scoring_data,
+    ttl_seconds=cache_settings.scoring_data_ttl_seconds,
+    on_replace=_on_scoring_data_replaced,
+)
+
+
 def _get_scoring_data() -> pd.DataFrame:
     """Get the scoring data from DataRobot."""
-    return dr.Dataset.get(scoring_dataset_id).get_as_dataframe()
+    return scoring_data_cache.get().frame
+
+
+def get_scoring_data_memory_report() -> pd.DataFrame:
+    """
+    Report how much memory each scoring data column uses.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dtype and memory usage in bytes of every column as loaded and after
+        load-time compaction, indexed by column name.
+    """
+    return scoring_data_cache.get().memory_report
 
 
 def get_scoring_data(
     filter_selection: Optional[List[FilterSpec]] = None,
+    display_history_length: Optional[int] = None,
 ) -> list[dict[str, Any]]:
     """
     Get scoring data from DataRobot.
@@ -179,54 +452,246 @@ def get_scoring_data(
     ----------
     filter_selection : Optional[List[FilterSpec]]
         List of filters to apply to the data.
+    display_history_length : Optional[int]
+        Number of historical dates needed for display. When set, older
+        history is dropped, keeping at least what the deployment's
+        feature derivation window needs for predictions.
     """
-    df = _get_scoring_data()
-    if filter_selection is None:
-        return df.to_dict(orient="records")  # type: ignore[no-any-return]
-    for widget in filter_selection:
-        widget_values = widget.selected_values
-        column_name = widget.column
-        if len(widget_values) > 0:
-            df = df[df[column_name].isin(widget_values)]
-    if len(df) == 0:
-        raise ValueError(
-            gettext(
-                "No data available for the selected series. Try a different combination of filters."
-            )
-        )
+    df = get_scoring_data_frame(filter_selection, display_history_length)
     return df.to_dict(orient="records")  # type: ignore[no-any-return]
 
 
-def get_filters() -> List[MultiSelectFilter]:
+def get_scoring_data_frame(
+    filter_selection: Optional[List[FilterSpec]] = None,
+    display_history_length: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Get scoring data from DataRobot as a DataFrame.
+
+    Same as `get_scoring_data`, for callers that serialize the frame themselves.
+    The returned frame may be shared with the cache and must not be modified.
+
+    Parameters
+    ----------
+    filter_selection : Optional[List[FilterSpec]]
+        List of filters to apply to the data.
+    display_history_length : Optional[int]
+        Number of historical dates needed for display.
+    """
+    return _select_scoring_data(
+        scoring_data_cache.get(), filter_selection, display_history_length
+    )
+
+
+def get_versioned_scoring_data_frame(
+    filter_selection: Optional[List[FilterSpec]] = None,
+    display_history_length: Optional[int] = None,
+) -> Tuple[str, pd.DataFrame]:
+    """
+    Get scoring data as a DataFrame together with its dataset version.
+
+    Same as `get_scoring_data_frame`. The version identifies the loaded
+    scoring data the frame was taken from, which a background refresh may
+    replace between two calls.
+
+    Parameters
+    ----------
+    filter_selection : Optional[List[FilterSpec]]
+        List of filters to apply to the data.
+    display_history_length : Optional[int]
+        Number of historical dates needed for display.
+
+    Returns
+    -------
+    Tuple[str, pd.DataFrame]
+        Scoring dataset version id and the selected scoring data.
+    """
+    snapshot = scoring_data_cache.get()
+    return snapshot.version_id, _select_scoring_data(
+        snapshot, filter_selection, display_history_length
+    )
+
+
+def _select_scoring_data(
+    snapshot: ScoringDataSnapshot,
+    filter_selection: Optional[List[FilterSpec]],
+    display_history_length: Optional[int],
+) -> pd.DataFrame:
+    """Filter and window the scoring data of one snapshot."""
+    df = snapshot.frame
+    if filter_selection is not None:
+        series_index = snapshot.series_index
+        positions = series_index.select(
+            [widget for widget in filter_selection if widget.column in series_index]
+        )
+        if positions is not None:
+            df = df.take(positions)
+        for widget in filter_selection:
+            widget_values = widget.selected_values
+            column_name = widget.column
+            if column_name not in series_index and len(widget_values) > 0:
+                df = df[df[column_name].isin(widget_values)]
+        if len(df) == 0:
+            raise ValueError(
+                gettext(
+                    "No data available for the selected series. Try a different combination of filters."
+                )
+            )
+    if display_history_length is not None:
+        df = df[
+            window_dates(
+                snapshot.timestamps.loc[df.index],
+                df[app_settings.target].notna(),
+                history_length=max(
+                    display_history_length, _get_prediction_history_length()
+                ),
+            )
+        ]
+    return df
+
+
+async def get_scoring_data_frame_async(
+    filter_selection: Optional[List[FilterSpec]] = None,
+    display_history_length: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Async variant of `get_scoring_data_frame`.
+
+    Loading and filtering run in a worker thread, as the DataRobot SDK only
+    offers blocking calls.
+    """
+    return await asyncio.to_thread(
+        get_scoring_data_frame, filter_selection, display_history_length
+    )
+
+
+async def get_versioned_scoring_data_frame_async(
+    filter_selection: Optional[List[FilterSpec]] = None,
+    display_history_length: Optional[int] = None,
+) -> Tuple[str, pd.DataFrame]:
+    """Async variant of `get_versioned_scoring_data_frame`."""
+    return await asyncio.to_thread(
+        get_versioned_scoring_data_frame, filter_selection, display_history_length
+    )
+
+
+def _get_prediction_history_length() -> int:
+    """Historical dates covered by the feature derivation window."""
+    return 1 - app_settings.feature_derivation_window_start
+
+
+def _trim_to_prediction_window(
+    scoring_data: list[dict[str, Any]],
+) -> Tuple[list[dict[str, Any]], Optional[pd.Timestamp]]:
+    """
+    Drop scoring rows the deployment does not use.
+
+    Returns the rows `_get_prediction_window` keeps along with the forecast
+    point of the request.
+    """
+    df = pd.DataFrame(scoring_data)
+    series_id = app_settings.multiseries_id_column
+    datetime_column = app_settings.datetime_partition_column
+    target = app_settings.target
+    if any(column not in df.columns for column in (series_id, datetime_column, target)):
+        return scoring_data, None
+    window, forecast_point = _get_prediction_window(
+        df, parse_datetime_column(df[datetime_column], app_settings.date_format)
+    )
+    return [scoring_data[position] for position in window.index], forecast_point
+
+
+def _get_prediction_window(
+    df: pd.DataFrame, timestamps: pd.Series
+) -> Tuple[pd.DataFrame, Optional[pd.Timestamp]]:
+    """
+    Scoring rows the deployment uses and the forecast point they share.
+
+    Keeps the history inside the feature derivation window and the rows up to
+    the end of the forecast window, counted in dates from the forecast point
+    shared by all series of the rows (None when no target dates are known).
+    """
+    known = df[app_settings.target].notna()
+    forecast_point = get_forecast_point(timestamps, known)
+    mask = window_dates(
+        timestamps,
+        known,
+        history_length=_get_prediction_history_length(),
+        forecast_length=app_settings.forecast_window_end,
+        forecast_point=forecast_point,
+    )
+    return df[mask], forecast_point
+
+
+def get_filters(
+    filter_selection: Optional[List[FilterSpec]] = None,
+) -> List[MultiSelectFilter]:
     """
     Get available options for each filter.
 
+    When a partial selection is given, the options of each filter are narrowed
+    to values that still produce data in combination with the selections made
+    on the other filters.
+
+    Parameters
+    ----------
+    filter_selection : Optional[List[FilterSpec]]
+        Current selection of filter values.
+
     Returns
     -------
     List[MultiSelectFilter]
         Available filters and displays.
     """
 
-    scoring_data = _get_scoring_data()
+    valid_values = scoring_data_cache.get().filter_hierarchy.valid_values(
+        filter_selection
+    )
     filters = []
     for category in app_settings.filterable_categories:
         filters.append(
             MultiSelectFilter(
                 column_name=category.column_name,
                 display_name=category.display_name,
-                valid_values=scoring_data[category.column_name].unique().tolist(),
+                valid_values=valid_values[category.column_name],
             )
         )
     return filters
 
 
-def get_predictions(scoring_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+async def get_filters_async(
+    filter_selection: Optional[List[FilterSpec]] = None,
+) -> List[MultiSelectFilter]:
+    """Async variant of `get_filters`."""
+    return await asyncio.to_thread(get_filters, filter_selection)
+
+
+def get_predictions(
+    scoring_data: list[dict[str, Any]], explanations: bool = True
+) -> list[dict[str, Any]]:
     """Retrieve predictions in the format returned by DataRobot-Predict.
 
+    DataRobot forecasts all series of a request from one forecast point, the
+    latest date with a known target among them. Series covered by the
+    scheduled batch prediction job for that forecast point are answered from
+    its output when a batch predictions file is configured. Other predictions
+    are cached per series, keyed by the content of the series' rows, the
+    forecast point and the deployed model, in memory and optionally in an
+    on-disk store shared by all workers, so only series that were not
+    predicted before are sent to the deployment. Models with cross-series
+    features derive each series' features from the other series of the
+    request, so their predictions are neither cached nor looked up per series.
+
+    Prediction explanations make predictions considerably slower, so callers
+    that only need predicted values and intervals should turn them off.
+    Predictions with and without explanations are cached separately.
+
     Parameters
     ----------
     scoring_data : list[dict]
         A list of dictionaries containing the input data for generating predictions.
+    explanations : bool
+        Whether to compute the top `MAX_EXPLANATIONS` prediction explanations.
 
     Returns
     -------
@@ -234,20 +699,437 @@ def get_predictions(scoring_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
         List of predictions from deployed time series model.
     """
 
-    predictions = _get_predictions_cached(json.dumps(scoring_data, sort_keys=True))
+    pending = _lookup_predictions(scoring_data, explanations)
+    if pending.series_keys is None:
+        predictions = _predict(
+            pending.deployment,
+            pending.scoring_df,
+            pending.max_explanations,
+            pending.forecast_point,
+        )
+        return predictions.to_dict(orient="records")  # type: ignore[no-any-return]
+    missing = pending.missing
+    if len(missing) > 0:
+        pending.cached.update(
+            prediction_flight.run(
+                missing,
+                lambda keys: _predict_series(pending, missing[missing.isin(keys)]),
+            )
+        )
+    return _assemble_predictions(pending)
+
 
-    return predictions.to_dict(orient="records")  # type: ignore[no-any-return]
+async def get_predictions_async(
+    scoring_data: list[dict[str, Any]], explanations: bool = True
+) -> list[dict[str, Any]]:
+    """Async variant of `get_predictions`.
 
+    Cache lookups and DataRobot SDK calls run in a worker thread and prediction
+    requests are sent with a pooled async HTTP client, so the event loop keeps
+    serving other requests while predictions are computed. Concurrent sync and
+    async requests for the same series share one prediction request.
 
-@functools.lru_cache(maxsize=16)
-def _get_predictions_cached(scoring_data_json: str) -> pd.DataFrame:
-    predictions = predict(
-        deployment=dr.Deployment.get(time_series_deployment_id),
-        data_frame=pd.DataFrame(json.loads(scoring_data_json)),
-        max_explanations=3,
-    ).dataframe
+    Parameters
+    ----------
+    scoring_data : list[dict]
+        A list of dictionaries containing the input data for generating predictions.
+    explanations : bool
+        Whether to compute the top `MAX_EXPLANATIONS` prediction explanations.
 
-    return predictions
+    Returns
+    -------
+    list[dict[str, Any]]
+        List of predictions from deployed time series model.
+    """
+    pending = await asyncio.to_thread(_lookup_predictions, scoring_data, explanations)
+    if pending.series_keys is None:
+        predictions = await _predict_async(
+            pending.deployment,
+            pending.scoring_df,
+            pending.max_explanations,
+            pending.forecast_point,
+        )
+        return predictions.to_dict(orient="records")  # type: ignore[no-any-return]
+    missing = pending.missing
+    if len(missing) > 0:
+        pending.cached.update(
+            await prediction_flight.run_async(
+                missing,
+                lambda keys: _predict_series_async(
+                    pending, missing[missing.isin(keys)]
+                ),
+            )
+        )
+    return _assemble_predictions(pending)
+
+
+@dataclass
+class _PendingPredictions:
+    """Predictions of one request found so far, and the series still to predict."""
+
+    deployment: dr.Deployment
+    model_id: str
+    scoring_df: pd.DataFrame
+    # Forecast point of the whole request, shared by all of its series
+    forecast_point: Optional[pd.Timestamp]
+    max_explanations: int
+    # Cache key of every series, None when predictions are not cached per series
+    series_keys: Optional[pd.Series]
+    records_by_series: dict[Any, list[dict[str, Any]]]
+    cached: dict[str, list[dict[str, Any]]]
+    # Cache keys of the series found in no cache, indexed by series id
+    missing: pd.Series
+
+
+def _lookup_predictions(
+    scoring_data: list[dict[str, Any]], explanations: bool
+) -> _PendingPredictions:
+    """Look up the predictions of every series in the forecast store and caches."""
+    max_explanations = MAX_EXPLANATIONS if explanations else 0
+    records, forecast_point = _trim_to_prediction_window(scoring_data)
+    scoring_df = pd.DataFrame(records)
+    series_id = app_settings.multiseries_id_column
+    deployment = _get_deployment()
+    model_id = _get_model_id(deployment)
+    if series_id not in scoring_df.columns or _uses_cross_series_features():
+        return _PendingPredictions(
+            deployment,
+            model_id,
+            scoring_df,
+            forecast_point,
+            max_explanations,
+            None,
+            {},
+            {},
+            pd.Series(),
+        )
+
+    series_keys = _get_series_keys(
+        scoring_df, model_id, max_explanations, forecast_point
+    )
+    records_by_series = _get_batch_forecasts(scoring_df, explanations, forecast_point)
+    pending = series_keys[~series_keys.index.isin(list(records_by_series))]
+    cached = _get_cached_predictions(pending)
+    records_by_series.update(
+        (series, cached[key]) for series, key in pending.items() if key in cached
+    )
+    return _PendingPredictions(
+        deployment,
+        model_id,
+        scoring_df,
+        forecast_point,
+        max_explanations,
+        series_keys,
+        records_by_series,
+        cached,
+        pending[~pending.isin(list(cached))],
+    )
+
+
+def _get_model_id(deployment: dr.Deployment) -> str:
+    return str(deployment.model["id"]) if deployment.model else ""
+
+
+def _get_series_keys(
+    scoring_df: pd.DataFrame,
+    model_id: str,
+    max_explanations: int,
+    forecast_point: Optional[pd.Timestamp],
+) -> pd.Series:
+    """Prediction cache key of every series, by series id."""
+    forecast_point_id = forecast_point.isoformat() if forecast_point else ""
+    return hash_series(
+        scoring_df,
+        app_settings.multiseries_id_column,
+        salt=(
+            f"{time_series_deployment_id}/{model_id}/{max_explanations}"
+            f"/{forecast_point_id}"
+        ),
+    )
+
+
+def _get_cached_predictions(
+    series_keys: pd.Series,
+) -> dict[str, list[dict[str, Any]]]:
+    """Look up predictions in memory, then in the on-disk store, by cache key."""
+    cached = prediction_cache.get_many(series_keys)
+    if prediction_store is not None and len(cached) < len(series_keys):
+        stored = prediction_store.get_many(
+            key for key in series_keys if key not in cached
+        )
+        for key, records in stored.items():
+            prediction_cache.put(key, records)
+        cached.update(stored)
+    return cached
+
+
+def _assemble_predictions(pending: _PendingPredictions) -> list[dict[str, Any]]:
+    """Concatenate the records of all series in the order of the scoring data."""
+    assert pending.series_keys is not None
+    pending.records_by_series.update(
+        (series, pending.cached[key]) for series, key in pending.missing.items()
+    )
+    return [
+        dict(record)
+        for series in pending.series_keys.index
+        for record in pending.records_by_series[series]
+    ]
+
+
+def _predict_series(
+    pending: _PendingPredictions, series_keys: pd.Series
+) -> dict[str, list[dict[str, Any]]]:
+    """Predict the given series and cache their records under their keys."""
+    predictions = _predict(
+        pending.deployment,
+        _select_series(pending.scoring_df, series_keys),
+        pending.max_explanations,
+        pending.forecast_point,
+    )
+    return _cache_series_predictions(pending.model_id, series_keys, predictions)
+
+
+async def _predict_series_async(
+    pending: _PendingPredictions, series_keys: pd.Series
+) -> dict[str, list[dict[str, Any]]]:
+    """Async variant of `_predict_series`."""
+    predictions = await _predict_async(
+        pending.deployment,
+        _select_series(pending.scoring_df, series_keys),
+        pending.max_explanations,
+        pending.forecast_point,
+    )
+    return await asyncio.to_thread(
+        _cache_series_predictions, pending.model_id, series_keys, predictions
+    )
+
+
+def _select_series(scoring_df: pd.DataFrame, series_keys: pd.Series) -> pd.DataFrame:
+    """Scoring rows of the series in the index of ``series_keys``."""
+    series_id = app_settings.multiseries_id_column
+    return scoring_df[scoring_df[series_id].isin(series_keys.index)].reset_index(
+        drop=True
+    )
+
+
+def _cache_series_predictions(
+    model_id: str, series_keys: pd.Series, predictions: pd.DataFrame
+) -> dict[str, list[dict[str, Any]]]:
+    """Split predictions into records per series and cache them under their keys."""
+    series_id = app_settings.multiseries_id_column
+    predicted_by_series = {
+        series: frame.to_dict(orient="records")
+        for series, frame in predictions.groupby(series_id, sort=False)
+    }
+    predicted = {
+        key: predicted_by_series.get(series, []) for series, key in series_keys.items()
+    }
+    for key, records in predicted.items():
+        prediction_cache.put(key, records)
+    if prediction_store is not None:
+        prediction_store.put_many(time_series_deployment_id, model_id, predicted)
+    return predicted
+
+
+def _get_batch_forecasts(
+    scoring_df: pd.DataFrame,
+    explanations: bool,
+    forecast_point: Optional[pd.Timestamp],
+) -> dict[Any, list[dict[str, Any]]]:
+    """
+    Forecasts of the batch prediction job by series id.
+
+    Only series the batch job predicted from the forecast point of the
+    request are returned.
+    """
+    store = forecast_store_cache.get() if forecast_store_cache is not None else None
+    if (
+        store is None
+        or forecast_point is None
+        or (explanations and not store.has_explanations)
+    ):
+        return {}
+    series = scoring_df[app_settings.multiseries_id_column].drop_duplicates()
+    return store.get_records(pd.Series(forecast_point, index=series.to_numpy()))
+
+
+def _predict(
+    deployment: dr.Deployment,
+    scoring_df: pd.DataFrame,
+    max_explanations: int,
+    forecast_point: Optional[pd.Timestamp],
+) -> pd.DataFrame:
+    """
+    Score a frame with the time series deployment in parallel shards of series.
+
+    Every shard is forecast from the forecast point of the whole frame.
+    Frames are sent whole when the model uses cross-series features.
+    """
+
+    def predict_shard(shard: pd.DataFrame) -> pd.DataFrame:
+        return predict(
+            deployment=deployment,
+            data_frame=shard,
+            max_explanations=max_explanations,
+            settings=prediction_settings,
+            upload_stats=prediction_upload_stats,
+            forecast_point=forecast_point,
+        ).dataframe
+
+    series_id = app_settings.multiseries_id_column
+    if series_id not in scoring_df.columns or _uses_cross_series_features():
+        return predict_shard(scoring_df)
+    return predict_in_shards(
+        predict_shard,
+        scoring_df,
+        series_id,
+        prediction_settings,
+        prediction_executor,
+    )
+
+
+async def _predict_async(
+    deployment: dr.Deployment,
+    scoring_df: pd.DataFrame,
+    max_explanations: int,
+    forecast_point: Optional[pd.Timestamp],
+) -> pd.DataFrame:
+    """Async variant of `_predict`."""
+    client = get_async_http_client(prediction_settings)
+
+    async def predict_shard(shard: pd.DataFrame) -> pd.DataFrame:
+        return await predict_async(
+            client,
+            deployment,
+            shard,
+            max_explanations,
+            prediction_settings,
+            prediction_upload_stats,
+            forecast_point,
+        )
+
+    series_id = app_settings.multiseries_id_column
+    if series_id not in scoring_df.columns or await asyncio.to_thread(
+        _uses_cross_series_features
+    ):
+        return await predict_shard(scoring_df)
+    return await predict_in_shards_async(
+        predict_shard, scoring_df, series_id, prediction_settings
+    )
+
+
+def get_prediction_upload_stats() -> dict[str, int]:
+    """
+    Report the size of the prediction requests sent to the deployment.
+
+    Returns
+    -------
+    dict[str, int]
+        ``requests``: prediction requests sent, including retries, ``rows``:
+        scoring rows sent, ``csv_bytes``: size of the scoring rows as CSV,
+        ``sent_bytes``: request body bytes sent after compression.
+    """
+    return prediction_upload_stats.stats()
+
+
+def _get_deployment() -> dr.Deployment:
+    """Get the time series deployment, cached for the metadata TTL."""
+    deployment: dr.Deployment = metadata_cache.get(
+        f"deployment/{time_series_deployment_id}",
+        lambda: dr.Deployment.get(time_series_deployment_id),
+    )
+    return deployment
+
+
+def _get_project() -> dr.Project:
+    """Get the modeling project, cached for the metadata TTL."""
+    project: dr.Project = metadata_cache.get(
+        f"project/{app_settings.project_id}",
+        lambda: dr.Project.get(app_settings.project_id),
+    )
+    return project
+
+
+def _uses_cross_series_features() -> bool:
+    """Whether the model derives features of a series from the other series."""
+    partitioning: dr.DatetimePartitioning = metadata_cache.get(
+        f"partitioning/{app_settings.project_id}",
+        lambda: dr.DatetimePartitioning.get(app_settings.project_id),
+    )
+    return bool(partitioning.use_cross_series_features)
+
+
+def get_metadata_cache_stats() -> dict[str, int]:
+    """
+    Report how DataRobot deployment and project lookups were served.
+
+    Returns
+    -------
+    dict[str, int]
+        ``hits``: lookups answered from the cache, i.e. remote calls avoided,
+        ``misses``: lookups that called DataRobot, ``entries``: cached objects.
+    """
+    return metadata_cache.stats()
+
+
+# A model replacement changes the keys of cached predictions once the
+# deployment's metadata has expired
+metadata_cache: TTLCache[Any] = TTLCache(
+    ttl_seconds=cache_settings.metadata_ttl_seconds
+)
+
+prediction_cache: LRUCache[list[dict[str, Any]]] = LRUCache(
+    max_entries=cache_settings.prediction_cache_max_series
+)
+# Concurrent requests for the same series wait for one prediction request
+prediction_flight: SingleFlight[list[dict[str, Any]]] = SingleFlight()
+
+
+def get_prediction_coalescing_stats() -> dict[str, int]:
+    """
+    Report how many series predictions were shared between concurrent requests.
+
+    Returns
+    -------
+    dict[str, int]
+        ``requested``: series that missed the caches, ``computed``: series sent
+        to the deployment, ``coalesced``: series that waited for a prediction
+        already in flight for another request, ``in_flight``: series being
+        predicted right now.
+    """
+    return prediction_flight.stats()
+
+
+def _load_forecast_store(
+    loaded_version: Optional[str],
+) -> Optional[Tuple[str, Optional[ForecastStore]]]:
+    """Load the batch prediction job output unless the file is unchanged."""
+    assert forecast_store_settings.batch_predictions_path is not None
+    return load_forecast_store(
+        forecast_store_settings.batch_predictions_path,
+        app_settings.multiseries_id_column,
+        (app_settings.datetime_partition_column,),
+        loaded_version,
+    )
+
+
+forecast_store_settings = ForecastStoreSettings()
+forecast_store_cache = (
+    RefreshingCache(
+        _load_forecast_store, ttl_seconds=cache_settings.scoring_data_ttl_seconds
+    )
+    if forecast_store_settings.batch_predictions_path is not None
+    else None
+)
+
+prediction_store = (
+    PredictionStore(
+        cache_settings.cache_dir / "predictions.sqlite",
+        max_bytes=cache_settings.prediction_store_max_bytes,
+    )
+    if cache_settings.prediction_store_enabled
+    else None
+)
 
 
 def get_standardized_predictions(
@@ -267,28 +1149,29 @@ def get_standardized_predictions(
     list[PredictionRow]
         A list of PredictionRow objects representing the processed and standardized predictions.
     """
-    predictions = get_predictions(scoring_data)
-    processed_predictions = _process_predictions(predictions)
+    return ForecastResult(scoring_data).standardized_predictions.to_rows()
 
-    return processed_predictions
 
-
-def _process_predictions(predictions: list[dict[str, Any]]) -> list[PredictionRow]:
+def _process_predictions(predictions: list[dict[str, Any]]) -> PredictionFrame:
     """Translate predictions into standardized format."""
+    totals = (
+        _get_forecast_values(pd.DataFrame(predictions))
+        .groupby("date_id")
+        .sum()
+        .reset_index()
+    )
+    return _to_prediction_frame(totals)
 
-    data = pd.DataFrame(predictions)
 
+def _get_forecast_values(data: pd.DataFrame) -> pd.DataFrame:
+    """Date, prediction and interval columns of predictions, under standard names."""
     prediction_interval = f"{app_settings.prediction_interval:.0f}"
-    bound_at_zero = app_settings.lower_bound_forecast_at_0
 
-    target = dr.Project.get(app_settings.project_id).target
+    target = _get_project().target
 
     date_id = app_settings.datetime_partition_column
-    series_id = app_settings.multiseries_id_column
     target = f"{target}_PREDICTION"
-    slim_predictions = data[[series_id, date_id, target]].rename(
-        columns={date_id: "date_id"}
-    )
+    slim_predictions = data[[date_id, target]].rename(columns={date_id: "date_id"})
 
     percentile_prefix = f"PREDICTION_{prediction_interval}_PERCENTILE"
 
@@ -296,40 +1179,154 @@ def _process_predictions(predictions: list[dict[str, Any]]) -> list[PredictionRo
 
     clean_predictions = pd.concat([slim_predictions, intervals], axis=1)
 
-    clean_predictions = (
-        clean_predictions.rename(
-            columns={
-                target: "prediction",
-                f"{percentile_prefix}_LOW": "low",
-                f"{percentile_prefix}_HIGH": "high",
-            }
-        )
-        .groupby("date_id")
-        .sum()
-        .reset_index()
+    return clean_predictions.rename(
+        columns={
+            target: "prediction",
+            f"{percentile_prefix}_LOW": "low",
+            f"{percentile_prefix}_HIGH": "high",
+        }
     )
-    if bound_at_zero:
+
+
+def _to_prediction_frame(totals: pd.DataFrame) -> PredictionFrame:
+    """Standardized forecast from forecast totals by date."""
+    if app_settings.lower_bound_forecast_at_0:
         bounds = ["prediction", "low", "high"]
-        clean_predictions[bounds] = clean_predictions[bounds].clip(lower=0)
-    return [PredictionRow(**i) for i in clean_predictions.to_dict(orient="records")]
+        totals[bounds] = totals[bounds].clip(lower=0)
+    return PredictionFrame(
+        date_id=totals["date_id"].to_numpy(dtype=object),
+        prediction=totals["prediction"].to_numpy(dtype="float64"),
+        low=totals["low"].to_numpy(dtype="float64"),
+        high=totals["high"].to_numpy(dtype="float64"),
+    )
+
+
+def get_rollup_forecast(
+    filter_selection: Optional[List[FilterSpec]] = None,
+) -> PredictionFrame:
+    """
+    Get the standardized forecast of a filter selection from the rollup cube.
+
+    The forecasts of all series are summed once per scoring data version and
+    deployed model into a `RollupCube` over the filterable categories, so the
+    totals of any Region, Market or Store combination are added up from a
+    few precomputed vectors instead of predicting and grouping the selection.
+    Selections on columns outside the filterable categories are forecast
+    like `get_standardized_predictions` does.
+
+    Parameters
+    ----------
+    filter_selection : Optional[List[FilterSpec]]
+        List of filters to apply to the data.
+
+    Returns
+    -------
+    PredictionFrame
+        Forecast totals of the selection by date.
+    """
+    totals = rollup_cache.get().total(filter_selection or [])
+    if totals is None:
+        return ForecastResult(
+            get_scoring_data(
+                filter_selection,
+                display_history_length=_get_prediction_history_length(),
+            )
+        ).standardized_predictions
+    if len(totals) == 0:
+        raise ValueError(
+            gettext(
+                "No data available for the selected series. Try a different combination of filters."
+            )
+        )
+    return _to_prediction_frame(totals)
+
+
+async def get_rollup_forecast_async(
+    filter_selection: Optional[List[FilterSpec]] = None,
+) -> PredictionFrame:
+    """Async variant of `get_rollup_forecast`."""
+    return await asyncio.to_thread(get_rollup_forecast, filter_selection)
+
+
+def _load_rollup_cube(
+    loaded_version: Optional[str],
+) -> Optional[Tuple[str, RollupCube]]:
+    """
+    Forecast every series and build the rollup cube, unless its inputs are unchanged.
+
+    The version is the scoring data version and the deployed model. Series
+    forecasts come from the forecast store and prediction caches where
+    possible, so only series no request has predicted yet are sent.
+    """
+    snapshot = scoring_data_cache.get()
+    version = f"{snapshot.version_id}/{_get_model_id(_get_deployment())}"
+    if version == loaded_version:
+        return None
+    category_columns = [
+        category.column_name for category in app_settings.filterable_categories
+    ]
+    series_id = app_settings.multiseries_id_column
+    scoring_df = get_scoring_data_frame(
+        display_history_length=_get_prediction_history_length()
+    )
+    forecasts = pd.DataFrame(
+        get_predictions(scoring_df.to_dict(orient="records"), explanations=False)
+    )
+    values = _get_forecast_values(forecasts)
+    if series_id in forecasts.columns:
+        series_categories = snapshot.frame.drop_duplicates(series_id).set_index(
+            series_id
+        )[[column for column in category_columns if column != series_id]]
+        values = pd.concat(
+            [
+                values,
+                series_categories.reindex(forecasts[series_id]).reset_index(),
+            ],
+            axis=1,
+        )
+    else:
+        category_columns = []
+    cube = RollupCube.from_frame(
+        values, category_columns, "date_id", ["prediction", "low", "high"]
+    )
+    logger.info("Built rollup cube of %d forecast rows", len(values))
+    return version, cube
+
+
+rollup_cache = RefreshingCache(
+    _load_rollup_cube, ttl_seconds=cache_settings.scoring_data_ttl_seconds
+)
 
 
 def get_formatted_predictions(
-    scoring_data: list[dict[str, Any]],
+    scoring_data: list[dict[str, Any]], explanations: bool = True
 ) -> list[dict[str, Any]]:
     """Format predictions for the frontend."""
-    predictions = get_predictions(scoring_data)
-    formatted_predictions = _format_predictions(predictions)
+    formatted_predictions = get_formatted_predictions_frame(scoring_data, explanations)
 
-    return formatted_predictions
+    return formatted_predictions.to_dict(orient="records")  # type: ignore[no-any-return]
 
 
-def _format_predictions(predictions: list[dict[str, Any]]) -> list[dict[Any, Any]]:
+def get_formatted_predictions_frame(
+    scoring_data: list[dict[str, Any]], explanations: bool = True
+) -> pd.DataFrame:
+    """Format predictions for the frontend as a DataFrame."""
+    return ForecastResult(scoring_data).get_formatted_frame(explanations)
+
+
+async def get_formatted_predictions_frame_async(
+    scoring_data: list[dict[str, Any]], explanations: bool = True
+) -> pd.DataFrame:
+    """Async variant of `get_formatted_predictions_frame`."""
+    return await ForecastResult(scoring_data).get_formatted_frame_async(explanations)
+
+
+def _format_predictions(predictions: list[dict[str, Any]]) -> pd.DataFrame:
     """Format predictions for the frontend."""
 
     data = pd.DataFrame(predictions)
 
-    target = dr.Project.get(app_settings.project_id).target
+    target = _get_project().target
     multiseries_id_column = app_settings.multiseries_id_column
     date_id = app_settings.datetime_partition_column
     prediction_interval = f"{app_settings.prediction_interval:.0f}"
@@ -341,32 +1338,218 @@ def _format_predictions(predictions: list[dict[str, Any]]) -> list[dict[Any, Any
     data["forecastDistance"] = data["FORECAST_DISTANCE"]
     data["forecastPoint"] = data["FORECAST_POINT"]
 
-    data["predictionIntervals"] = data.apply(
-        lambda x: {
-            prediction_interval: {
-                "low": x[f"{percentile_prefix}_LOW"],
-                "high": x[f"{percentile_prefix}_HIGH"],
-            }
-        },
-        axis=1,
-    )
+    data["predictionIntervals"] = [
+        {prediction_interval: {"low": low, "high": high}}
+        for low, high in zip(
+            data[f"{percentile_prefix}_LOW"].to_numpy(dtype=object),
+            data[f"{percentile_prefix}_HIGH"].to_numpy(dtype=object),
+        )
+    ]
 
-    data["predictionExplanations"] = data.apply(
-        lambda x: [
+    # Values are converted to Python objects, as row-wise access would return them
+    explanations = [
+        [
             {
-                "feature": x[f"EXPLANATION_{i}_FEATURE_NAME"],
-                "featureValue": x[f"EXPLANATION_{i}_ACTUAL_VALUE"],
+                "feature": feature,
+                "featureValue": feature_value,
                 "label": target,
-                "qualitativeStrength": x[f"EXPLANATION_{i}_QUALITATIVE_STRENGTH"],
-                "strength": x[f"EXPLANATION_{i}_STRENGTH"],
+                "qualitativeStrength": qualitative_strength,
+                "strength": strength,
             }
-            for i in range(1, len(x.index))
-            if f"EXPLANATION_{i}_FEATURE_NAME" in x.index
-        ],
-        axis=1,
+            for feature, feature_value, qualitative_strength, strength in zip(
+                data[f"EXPLANATION_{i}_FEATURE_NAME"].to_numpy(dtype=object),
+                data[f"EXPLANATION_{i}_ACTUAL_VALUE"].to_numpy(dtype=object),
+                data[f"EXPLANATION_{i}_QUALITATIVE_STRENGTH"].to_numpy(dtype=object),
+                data[f"EXPLANATION_{i}_STRENGTH"].to_numpy(dtype=object),
+            )
+        ]
+        for i in _get_explanation_numbers(data.columns)
+    ]
+    data["predictionExplanations"] = (
+        [list(row) for row in zip(*explanations)]
+        if explanations
+        else [[] for _ in range(len(data))]
     )
 
-    return data.to_dict(orient="records")  # type: ignore[no-any-return]
+    return data
+
+
+def _get_explanation_numbers(columns: pd.Index) -> list[int]:
+    """Numbers of the prediction explanations present in prediction columns."""
+    return [
+        i for i in range(1, len(columns)) if f"EXPLANATION_{i}_FEATURE_NAME" in columns
+    ]
+
+
+class ForecastResult:
+    """
+    Forecast of one scoring data selection and the views derived from it.
+
+    Predictions, the standardized forecast, the prediction explanations and
+    their top features, the chart and the LLM summary are each computed on
+    first use and then reused, so serving a selection predicts and converts
+    every frame once. Predictions with explanations are only retrieved once
+    a view needs them.
+
+    Parameters
+    ----------
+    scoring_data : list[dict[str, Any]]
+        Scoring data of the selection, as returned by `get_scoring_data`.
+    explained_predictions : Optional[list[dict[str, Any]]]
+        Predictions with explanations already retrieved for the selection.
+    """
+
+    def __init__(
+        self,
+        scoring_data: list[dict[str, Any]],
+        explained_predictions: Optional[list[dict[str, Any]]] = None,
+    ) -> None:
+        self.scoring_data = scoring_data
+        if explained_predictions is not None:
+            self.explained_predictions = explained_predictions
+        self._charts: dict[int, dict[str, Any]] = {}
+        self._formatted_frames: dict[bool, pd.DataFrame] = {}
+        self._llm_summary: Optional[ForecastSummary] = None
+
+    @classmethod
+    def from_predictions(cls, predictions: list[dict[str, Any]]) -> ForecastResult:
+        """Result for predictions with explanations retrieved without this class."""
+        return cls([], explained_predictions=predictions)
+
+    @functools.cached_property
+    def predictions(self) -> list[dict[str, Any]]:
+        return get_predictions(self.scoring_data, explanations=False)
+
+    @functools.cached_property
+    def explained_predictions(self) -> list[dict[str, Any]]:
+        return get_predictions(self.scoring_data, explanations=True)
+
+    @functools.cached_property
+    def standardized_predictions(self) -> PredictionFrame:
+        # Predicted values do not depend on explanations, so reuse whichever is at hand
+        if (
+            "predictions" not in self.__dict__
+            and "explained_predictions" in self.__dict__
+        ):
+            return _process_predictions(self.explained_predictions)
+        return _process_predictions(self.predictions)
+
+    @functools.cached_property
+    def standardized_frame(self) -> pd.DataFrame:
+        return self.standardized_predictions.to_frame()
+
+    @functools.cached_property
+    def history_frame(self) -> pd.DataFrame:
+        return _aggregate_scoring_data(self.scoring_data)
+
+    @functools.cached_property
+    def explanation_frame(self) -> pd.DataFrame:
+        return get_pred_ex_df(self.explained_predictions)
+
+    @functools.cached_property
+    def target_derived_top_features(self) -> pd.DataFrame:
+        return get_top_features(
+            _select_explanations(self.explanation_frame, ex_target=False)
+        )
+
+    @functools.cached_property
+    def exogenous_top_features(self) -> pd.DataFrame:
+        return get_top_features(
+            _select_explanations(self.explanation_frame, ex_target=True)
+        )
+
+    @functools.cached_property
+    def explain_df(self) -> pd.DataFrame:
+        return _rank_explanations(
+            _assemble_top_features(self.target_derived_top_features, ex_target=False),
+            _assemble_top_features(self.exogenous_top_features, ex_target=True),
+        )
+
+    def get_chart(self, n_historical_records_to_display: int) -> dict[str, Any]:
+        """Plotly figure of the forecast, see `get_forecast_as_plotly_json`."""
+        if n_historical_records_to_display not in self._charts:
+            self._charts[n_historical_records_to_display] = _make_forecast_chart(
+                self.standardized_frame,
+                self.history_frame.tail(n_historical_records_to_display),
+            )
+        return self._charts[n_historical_records_to_display]
+
+    def get_formatted_frame(self, explanations: bool = True) -> pd.DataFrame:
+        """Predictions formatted for the frontend."""
+        if explanations not in self._formatted_frames:
+            self._formatted_frames[explanations] = _format_predictions(
+                self.explained_predictions if explanations else self.predictions
+            )
+        return self._formatted_frames[explanations]
+
+    async def get_formatted_frame_async(
+        self, explanations: bool = True
+    ) -> pd.DataFrame:
+        """Async variant of `get_formatted_frame`."""
+        if explanations not in self._formatted_frames:
+            if explanations and "explained_predictions" not in self.__dict__:
+                self.explained_predictions = await get_predictions_async(
+                    self.scoring_data, explanations=True
+                )
+            elif not explanations and "predictions" not in self.__dict__:
+                self.predictions = await get_predictions_async(
+                    self.scoring_data, explanations=False
+                )
+            await asyncio.to_thread(self.get_formatted_frame, explanations)
+        return self._formatted_frames[explanations]
+
+    def _get_llm_prompts(self) -> Tuple[str, str, str]:
+        """Prompts of the target derived and exogenous summaries and the headline."""
+        return (
+            _get_summary_prompt(self.target_derived_top_features, ex_target=False),
+            _get_summary_prompt(self.exogenous_top_features, ex_target=True),
+            _get_headline_prompt(self.standardized_frame),
+        )
+
+    def get_llm_summary(self) -> ForecastSummary:
+        """LLM headline and summary of the forecast, see `get_llm_summary`."""
+        if self._llm_summary is None:
+            include_target_prompt, exclude_target_prompt, headline_prompt = (
+                self._get_llm_prompts()
+            )
+            include_target_summary = _get_completion(include_target_prompt)
+            exclude_target_summary = _get_completion(exclude_target_prompt)
+            self._llm_summary = ForecastSummary(
+                headline=_get_completion(
+                    prompt=headline_prompt,
+                    system_prompt=app_settings.headline_prompt,
+                    temperature=0.2,
+                ),
+                summary_body=include_target_summary + "\n\n\n" + exclude_target_summary,
+            )
+        return self._llm_summary
+
+    async def get_llm_summary_async(self) -> ForecastSummary:
+        """Async variant of `get_llm_summary`, requesting all completions at once."""
+        if self._llm_summary is None:
+            (
+                include_target_prompt,
+                exclude_target_prompt,
+                headline_prompt,
+            ) = await asyncio.to_thread(self._get_llm_prompts)
+            (
+                include_target_summary,
+                exclude_target_summary,
+                headline,
+            ) = await asyncio.gather(
+                _get_completion_async(include_target_prompt),
+                _get_completion_async(exclude_target_prompt),
+                _get_completion_async(
+                    prompt=headline_prompt,
+                    system_prompt=app_settings.headline_prompt,
+                    temperature=0.2,
+                ),
+            )
+            self._llm_summary = ForecastSummary(
+                headline=headline,
+                summary_body=include_target_summary + "\n\n\n" + exclude_target_summary,
+            )
+        return self._llm_summary
 
 
 def get_forecast_as_plotly_json(
@@ -393,16 +1576,16 @@ def get_forecast_as_plotly_json(
         A dictionary representation of the plotly figure.
     """
 
+    return ForecastResult(scoring_data).get_chart(n_historical_records_to_display)
+
+
+def _make_forecast_chart(
+    forecast: pd.DataFrame, history: pd.DataFrame
+) -> dict[str, Any]:
+    """Plot the standardized forecast after the aggregated history."""
     datetime_partition_column = app_settings.datetime_partition_column
     target = app_settings.target
 
-    forecast = pd.DataFrame(
-        [i.model_dump() for i in get_standardized_predictions(scoring_data)]
-    )
-    history = _aggregate_scoring_data(scoring_data).tail(
-        n_historical_records_to_display
-    )
-
     fig = make_subplots(specs=[[{"secondary_y": False}]])
 
     fig.add_trace(
@@ -504,20 +1687,30 @@ def _aggregate_scoring_data(scoring_data: list[dict[str, Any]]) -> pd.DataFrame:
 
 
 def get_pred_ex_df(preds: List[dict[str, Any]]) -> pd.DataFrame:
-    preds_df = pd.DataFrame(preds)
-    names = []
-    strengths = []
-    values = []
-
-    for i in range(1, 4):  # 1, 2, 3
-        names.extend(preds_df[f"EXPLANATION_{i}_FEATURE_NAME"])
-        strengths.extend(preds_df[f"EXPLANATION_{i}_STRENGTH"])
-        values.extend(preds_df[f"EXPLANATION_{i}_ACTUAL_VALUE"])
+    """
+    Stack the prediction explanations of all prediction rows into one frame.
 
+    Every ``EXPLANATION_{i}_*`` column group present is included, ordered by
+    explanation number and then by prediction row.
+    """
+    preds_df = pd.DataFrame(preds)
+    fields = {
+        "FEATURE_NAME": "feature",
+        "STRENGTH": "strength",
+        "ACTUAL_VALUE": "value",
+    }
+    numbers = _get_explanation_numbers(preds_df.columns)
+    # Column-major order puts all rows of one explanation number before the next
     pred_ex_df = pd.DataFrame(
-        {"feature": names, "strength": strengths, "value": values}
+        {
+            name: preds_df[[f"EXPLANATION_{i}_{field}" for i in numbers]]
+            .to_numpy(dtype=object)
+            .ravel(order="F")
+            for field, name in fields.items()
+        }
     )
-    return pred_ex_df
+    # Infer dtypes across all explanations, as for a single column of values
+    return pred_ex_df.infer_objects()
 
 
 def get_llm_summary(predictions: List[dict[str, Any]]) -> ForecastSummary:
@@ -540,31 +1733,36 @@ def get_llm_summary(predictions: List[dict[str, Any]]) -> ForecastSummary:
         An object containing the headline, summary body, and explanation dataset.
     """
 
-    # preds = pd.DataFrame(predictions)
-    processed_preds = _process_predictions(predictions)
-    pred_ex_df = get_pred_ex_df(predictions)
+    return ForecastResult.from_predictions(predictions).get_llm_summary()
+
 
-    # Create summary for target derived features
-    include_target_summary = _summarize_dataframe(pred_ex_df, ex_target=False)
+async def get_llm_summary_async(predictions: List[dict[str, Any]]) -> ForecastSummary:
+    """
+    Async variant of `get_llm_summary`.
 
-    # Create summary for exogenous features
-    exclude_target_summary = _summarize_dataframe(pred_ex_df, ex_target=True)
+    Both sub-summaries and the headline are requested from the LLM concurrently.
 
-    return ForecastSummary(
-        headline=_make_headline(processed_preds),
-        summary_body=include_target_summary + "\n\n\n" + exclude_target_summary,
-    )
+    Parameters
+    ----------
+    predictions : List[dict[str, Any]]
+        A list of dictionaries containing prediction data.
+
+    Returns
+    -------
+    ForecastSummary
+        An object containing the headline, summary body, and explanation dataset.
+    """
+    return await ForecastResult.from_predictions(predictions).get_llm_summary_async()
 
 
 def get_explain_df(predictions: List[dict[str, Any]]) -> pd.DataFrame:
-    pred_ex_df = get_pred_ex_df(predictions)
-    include_target_prompt_df = assemble_prediction_explanations(
-        pred_ex_df, ex_target=False
-    )
-    exclude_target_prompt_df = assemble_prediction_explanations(
-        pred_ex_df, ex_target=True
-    )
+    return ForecastResult.from_predictions(predictions).explain_df
 
+
+def _rank_explanations(
+    include_target_prompt_df: pd.DataFrame, exclude_target_prompt_df: pd.DataFrame
+) -> pd.DataFrame:
+    """Rank the top target derived and exogenous features together."""
     explain_df = pd.concat((include_target_prompt_df, exclude_target_prompt_df)).rename(
         columns={
             "Relative Importance": "relative_importance",
@@ -582,17 +1780,20 @@ def get_explain_df(predictions: List[dict[str, Any]]) -> pd.DataFrame:
 def assemble_prediction_explanations(
     explain_df: pd.DataFrame, ex_target: bool
 ) -> pd.DataFrame:
-    target = app_settings.target
+    prompt_df = get_top_features(_select_explanations(explain_df, ex_target))
+    return _assemble_top_features(prompt_df, ex_target)
+
+
+def _select_explanations(explain_df: pd.DataFrame, ex_target: bool) -> pd.DataFrame:
+    """Explanations by exogenous features, or by features derived from the target."""
+    target_derived = explain_df["feature"].str.startswith(app_settings.target + " (")
     if ex_target:
-        explain_df = explain_df[
-            ~explain_df["feature"].str.startswith(target + " (")
-        ].copy()
-    else:
-        explain_df = explain_df[
-            explain_df["feature"].str.startswith(target + " (")
-        ].copy()
-    prompt_df = get_top_features(explain_df)
-    return prompt_df.assign(is_target_derived=not ex_target).reset_index()
+        return explain_df[~target_derived].copy()
+    return explain_df[target_derived].copy()
+
+
+def _assemble_top_features(top_features: pd.DataFrame, ex_target: bool) -> pd.DataFrame:
+    return top_features.assign(is_target_derived=not ex_target).reset_index()
 
 
 def get_top_features(
@@ -601,8 +1802,10 @@ def get_top_features(
     top_n_features: int = 4,
 ) -> pd.DataFrame:
     total_strength = (
-        prediction_explanations_df.groupby("feature")["strength"]
-        .apply(lambda c: c.abs().sum())
+        prediction_explanations_df["strength"]
+        .abs()
+        .groupby(prediction_explanations_df["feature"])
+        .sum()
         .sort_values(ascending=False)
     )
     total_strength = ((total_strength / total_strength.sum()) * 100).astype(int)
@@ -618,11 +1821,8 @@ def get_top_features(
     return top_features
 
 
-def _summarize_dataframe(prompt_dataframe: pd.DataFrame, ex_target: bool) -> str:
-    """
-    Get the LLM sub-summary for the forecast.
-    """
-    target = app_settings.target
+def _get_summary_prompt(top_features: pd.DataFrame, ex_target: bool) -> str:
+    """Build the prompt of an LLM sub-summary."""
     if ex_target:
         prompt = gettext(
             "The following are the most important exogenous features "
@@ -631,10 +1831,7 @@ def _summarize_dataframe(prompt_dataframe: pd.DataFrame, ex_target: bool) -> str
             + "driver(s) for the forecast, explain any potential "
             + "intuitive, qualitative interpretation(s) "
             + "or explanation(s)."
-        ).format(target=target)
-        explain_df = prompt_dataframe[
-            ~prompt_dataframe["feature"].str.startswith(target + " (")
-        ].copy()
+        ).format(target=app_settings.target)
     else:
         prompt = gettext(
             "The following are the most important features in the "
@@ -643,38 +1840,22 @@ def _summarize_dataframe(prompt_dataframe: pd.DataFrame, ex_target: bool) -> str
             + "forecast, explain any potential intuitive,qualitative "
             + "interpretations or explanations."
         )
-        explain_df = prompt_dataframe[
-            prompt_dataframe["feature"].str.startswith(target + " (")
-        ].copy()
-    prompt_string = _get_prompt(
-        explain_df,
-        prompt,
-    )
-    prompt_completion = _get_completion(prompt_string, temperature=0)
-    return prompt_completion
+    return _get_prompt(top_features, prompt)
 
 
 def _get_prompt(
-    prediction_explanations_df: pd.DataFrame,
+    top_features: pd.DataFrame,
     prompt: str,
 ) -> str:
     """Build prompt to summarize prediction explanations data."""
-    top_features = get_top_features(
-        prediction_explanations_df=prediction_explanations_df
-    )
     top_features_string = top_features.drop(columns="relative_importance").to_string()
 
     return prompt + f"\n\n\n{top_features_string}"
 
 
-def _make_headline(standardized_predictions: list[PredictionRow]) -> str:
-    """Generate subheader for explanation."""
-    df = pd.DataFrame([i.model_dump() for i in standardized_predictions])
-    return _get_completion(
-        prompt=gettext("Forecast:") + str(df[["date_id", "prediction"]]),
-        system_prompt=app_settings.headline_prompt,
-        temperature=0.2,
-    )
+def _get_headline_prompt(forecast: pd.DataFrame) -> str:
+    """Build the prompt of the forecast headline from the standardized forecast."""
+    return gettext("Forecast:") + str(forecast[["date_id", "prediction"]])
 
 
 def share_access(emails: List[str]) -> None:
@@ -693,3 +1874,8 @@ def share_access(emails: List[str]) -> None:
     ]
     payload = {"operation": "updateRoles", "roles": roles}
     client.patch(url, json=payload)
+
+
+async def share_access_async(emails: List[str]) -> None:
+    """Async variant of `share_access`."""
+    await asyncio.to_thread(share_access, emails)
@@ -0,0 +1,538 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+End-to-end benchmark of the forecastic backend on synthetic data.
+
+The sample scoring data in ``assets/store_sales_predict.csv`` is replicated to
+a multiple of its series and run through the backend stages against a local
+stand-in for DataRobot, so no credentials or network access are needed.
+Wall time, peak memory and throughput of every stage are reported as JSON::
+
+    python -m forecastic.benchmark --scales 10 100 1000 --output benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import importlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from unittest import mock
+
+import datarobot as dr
+import numpy as np
+import pandas as pd
+import yaml
+
+DEFAULT_SOURCE = Path(__file__).parents[1] / "assets" / "store_sales_predict.csv"
+DEFAULT_SCALES = (10, 100, 1000)
+
+# Column of the sample data that is derived from the series id and the date
+ASSOCIATION_ID_COLUMN = "AssociationId"
+
+# Application settings matching the sample data, as written by the training notebook
+BENCHMARK_APP_SETTINGS: Dict[str, Any] = {
+    "registered_model_id": "benchmark",
+    "registered_model_version_id": "benchmark",
+    "what_if_features": [],
+    "important_features": [],
+    "prediction_interval": 80,
+    "use_case_id": "benchmark",
+    "project_id": "benchmark",
+    "model_id": "benchmark",
+    "model_name": "benchmark",
+    "date_format": "%Y-%m-%d",
+    "target": "Sales",
+    "multiseries_id_column": "Store",
+    "feature_derivation_window_start": -35,
+    "feature_derivation_window_end": 0,
+    "forecast_window_start": 1,
+    "forecast_window_end": 7,
+    "maximum_default_display_length": 70,
+    "timestep_settings": {},
+    "datetime_partition_column": "Date",
+    "datetime_partition_column_transformed": "Date (actual)",
+    "training_dataset_id": "benchmark",
+    "calendar_id": "benchmark",
+    "filterable_categories": [
+        {"column_name": "Region", "display_name": "Region"},
+        {"column_name": "Market", "display_name": "Market"},
+        {"column_name": "Store", "display_name": "Store"},
+    ],
+    "page_description": "Benchmark",
+    "lower_bound_forecast_at_0": True,
+    "graph_y_axis": "Sales",
+    "page_title": "Benchmark",
+    "headline_prompt": "Benchmark",
+}
+
+
+@dataclass
+class StageResult:
+    """Measurements of one benchmark stage."""
+
+    stage: str
+    rows: int
+    wall_seconds: float
+    peak_memory_bytes: int
+    rows_per_second: float
+
+
+def synthesize_scoring_data(
+    source: pd.DataFrame, scale: int, series_id_column: str, date_column: str
+) -> pd.DataFrame:
+    """
+    Replicate every series of ``source`` ``scale`` times under new series ids.
+
+    Copies keep their filterable categories, so each category value covers
+    ``scale`` times as many series.
+    """
+    copies = pd.concat([source] * scale, ignore_index=True)
+    copy_number = pd.Series(np.repeat(np.arange(1, scale + 1), len(source))).astype(str)
+    copies[series_id_column] = copies[series_id_column].astype(str) + " #" + copy_number
+    if ASSOCIATION_ID_COLUMN in copies.columns:
+        copies[ASSOCIATION_ID_COLUMN] = (
+            copies[series_id_column] + " - " + copies[date_column].astype(str)
+        )
+    return copies
+
+
+class DataRobotStandIn:
+    """
+    Local replacement for the DataRobot calls made by `forecastic.api`.
+
+    Serves one scoring dataset from memory and answers prediction requests with
+    synthetic forecasts and prediction explanations for every series.
+    """
+
+    dataset_id = "benchmark-scoring-data"
+
+    def __init__(self, app_settings: Dict[str, Any]) -> None:
+        self._settings = app_settings
+        self._csv = b""
+        self.version_id = ""
+
+    def serve(self, scoring_data: pd.DataFrame, version_id: str) -> None:
+        """Publish a new version of the scoring dataset."""
+        self._csv = scoring_data.to_csv(index=False).encode()
+        self.version_id = version_id
+
+    @contextlib.contextmanager
+    def patch(self) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch.object(dr.Dataset, "get", self._get_dataset))
+            stack.enter_context(
+                mock.patch.object(dr.client, "get_client", self._get_client)
+            )
+            stack.enter_context(mock.patch.object(dr.Project, "get", self._get_project))
+            stack.enter_context(
+                mock.patch.object(dr.Deployment, "get", self._get_deployment)
+            )
+            stack.enter_context(
+                mock.patch.object(
+                    dr.DatetimePartitioning, "get", self._get_partitioning
+                )
+            )
+            yield
+
+    def _get_dataset(self, *args: Any, **kwargs: Any) -> Any:
+        return SimpleNamespace(
+            id=self.dataset_id,
+            version_id=self.version_id,
+            size=len(self._csv),
+        )
+
+    def _get_client(self) -> Any:
+        return SimpleNamespace(get=self._get)
+
+    def _get(self, url: str, stream: bool = False) -> Any:
+        raw = io.BytesIO(self._csv)
+        return SimpleNamespace(
+            raw=raw,
+            headers={"Content-Length": str(len(self._csv))},
+            close=raw.close,
+        )
+
+    def _get_project(self, *args: Any, **kwargs: Any) -> Any:
+        return SimpleNamespace(target=self._settings["target"])
+
+    def _get_deployment(self, *args: Any, **kwargs: Any) -> Any:
+        return SimpleNamespace(id="benchmark", model={"id": "benchmark"})
+
+    def _get_partitioning(self, *args: Any, **kwargs: Any) -> Any:
+        return SimpleNamespace(use_cross_series_features=False)
+
+    def predict(
+        self,
+        deployment: Any,
+        data_frame: pd.DataFrame,
+        max_explanations: int = 0,
+        **kwargs: Any,
+    ) -> Any:
+        """Forecast the rows after each series' last known target value."""
+        series_id = self._settings["multiseries_id_column"]
+        date_column = self._settings["datetime_partition_column"]
+        target = self._settings["target"]
+        interval = f"PREDICTION_{self._settings['prediction_interval']}_PERCENTILE"
+
+        timestamps = pd.to_datetime(
+            data_frame[date_column], format=self._settings["date_format"]
+        )
+        series = data_frame[series_id]
+        forecast_point = (
+            timestamps.where(data_frame[target].notna())
+            .groupby(series)
+            .transform("max")
+        )
+        level = data_frame[target].groupby(series).transform("mean")
+        rows = pd.DataFrame(
+            {
+                series_id: series,
+                date_column: data_frame[date_column],
+                "timestamp": timestamps,
+                "FORECAST_POINT": forecast_point,
+                "level": level,
+            }
+        )[timestamps > forecast_point].sort_values(
+            [series_id, "timestamp"], kind="stable"
+        )
+        distance = rows.groupby(series_id, sort=False).cumcount() + 1
+        rows = rows[distance <= self._settings["forecast_window_end"]]
+        distance = distance[rows.index]
+
+        prediction = rows["level"] * (1 + 0.01 * distance)
+        predictions = pd.DataFrame(
+            {
+                series_id: rows[series_id],
+                date_column: rows[date_column],
+                "FORECAST_POINT": rows["FORECAST_POINT"].dt.strftime(
+                    "%Y-%m-%dT%H:%M:%S.%fZ"
+                ),
+                "FORECAST_DISTANCE": distance,
+                f"{target}_PREDICTION": prediction,
+                f"{interval}_LOW": prediction * 0.9,
+                f"{interval}_HIGH": prediction * 1.1,
+            }
+        ).reset_index(drop=True)
+
+        features = np.array(
+            [f"{target} (7 day mean)", f"{target} (1st lag)"]
+            + [
+                column
+                for column in data_frame.columns
+                if column not in (series_id, date_column, target)
+            ]
+        )
+        rng = np.random.default_rng(len(predictions))
+        for i in range(1, max_explanations + 1):
+            strength = rng.normal(scale=1000, size=len(predictions))
+            predictions[f"EXPLANATION_{i}_FEATURE_NAME"] = features[
+                rng.integers(len(features), size=len(predictions))
+            ]
+            predictions[f"EXPLANATION_{i}_STRENGTH"] = strength
+            predictions[f"EXPLANATION_{i}_ACTUAL_VALUE"] = rng.normal(
+                size=len(predictions)
+            )
+            predictions[f"EXPLANATION_{i}_QUALITATIVE_STRENGTH"] = np.where(
+                strength > 0, "+", "-"
+            )
+        return SimpleNamespace(dataframe=predictions, headers={})
+
+
+def measure(
+    stage: str,
+    rows: int,
+    run: Callable[[], Any],
+    reset: Optional[Callable[[], None]] = None,
+    repeat: int = 3,
+) -> StageResult:
+    """
+    Time a stage and record its peak memory.
+
+    Wall time is the fastest of ``repeat`` untraced runs. Peak memory is taken
+    from one additional run under `tracemalloc`, which sees allocations made by
+    Python and numpy but not by Arrow's memory pool. ``reset`` is called before
+    every run to restore the state the stage should start from.
+    """
+    timings = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    if reset is not None:
+        reset()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    wall_seconds = min(timings)
+    return StageResult(
+        stage=stage,
+        rows=rows,
+        wall_seconds=wall_seconds,
+        peak_memory_bytes=peak_memory,
+        rows_per_second=rows / wall_seconds if wall_seconds > 0 else float("inf"),
+    )
+
+
+@contextlib.contextmanager
+def _benchmark_api(work_dir: Path, stand_in: DataRobotStandIn) -> Iterator[ModuleType]:
+    """Import `forecastic.api` configured against the stand-in."""
+    if "forecastic.api" in sys.modules:
+        raise RuntimeError(
+            "forecastic.api is already imported; run the benchmark in a fresh process"
+        )
+    settings_path = work_dir / "train_model_output.yaml"
+    settings_path.write_text(yaml.safe_dump(BENCHMARK_APP_SETTINGS))
+    env = {
+        "FORECAST_DEPLOYMENT_ID": "benchmark",
+        "FORECAST_SCORING_DATASET_ID": stand_in.dataset_id,
+        "FORECAST_CACHE_DIR": str(work_dir / "cache"),
+        "FORECAST_DISK_CACHE_ENABLED": "true",
+        # Keep the scoring data from being revalidated in the background
+        "FORECAST_SCORING_DATA_TTL_SECONDS": str(10**9),
+    }
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, env))
+        # The settings file name is joined onto the package path, so an
+        # absolute path points the api at the benchmark settings
+        stack.enter_context(
+            mock.patch(
+                "forecastic.resources.app_settings_file_name", str(settings_path)
+            )
+        )
+        stack.enter_context(stand_in.patch())
+        api = importlib.import_module("forecastic.api")
+        stack.enter_context(mock.patch.object(api, "predict", stand_in.predict))
+        try:
+            yield api
+        finally:
+            sys.modules.pop("forecastic.api", None)
+
+
+def _benchmark_scale(
+    api: ModuleType,
+    stand_in: DataRobotStandIn,
+    source: pd.DataFrame,
+    scale: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    """Run every stage on the source data replicated ``scale`` times."""
+    app_settings = api.app_settings
+    scoring_frame = synthesize_scoring_data(
+        source,
+        scale,
+        app_settings.multiseries_id_column,
+        app_settings.datetime_partition_column,
+    )
+    stand_in.serve(scoring_frame, version_id=f"x{scale}")
+    api.scoring_data_cache.clear()
+    api.prediction_cache.clear()
+    api.rollup_cache.clear()
+
+    dataset_cache_dir = api.cache_settings.cache_dir / "datasets"
+    display_length = app_settings.maximum_default_display_length
+
+    def drop_all_caches() -> None:
+        api.scoring_data_cache.clear()
+        shutil.rmtree(dataset_cache_dir, ignore_errors=True)
+
+    def get_scoring_data() -> list[dict[str, Any]]:
+        return api.get_scoring_data(  # type: ignore[no-any-return]
+            display_history_length=display_length
+        )
+
+    n_rows = len(scoring_frame)
+    stages = [
+        measure(
+            "get_scoring_data[download]",
+            n_rows,
+            get_scoring_data,
+            reset=drop_all_caches,
+            repeat=repeat,
+        ),
+        measure(
+            "get_scoring_data[disk_cache]",
+            n_rows,
+            get_scoring_data,
+            reset=api.scoring_data_cache.clear,
+            repeat=repeat,
+        ),
+        measure("get_scoring_data[memory]", n_rows, get_scoring_data, repeat=repeat),
+        measure("get_filters", n_rows, api.get_filters, repeat=repeat),
+    ]
+
+    scoring_data = get_scoring_data()
+    predictions = api.get_predictions(scoring_data)
+    api.get_predictions(scoring_data, explanations=False)
+    n_predictions = len(predictions)
+    rollup_column = app_settings.filterable_categories[0].column_name
+    rollup_selection = [
+        api.FilterSpec(
+            column=rollup_column,
+            selected_values=[str(scoring_frame[rollup_column].iloc[0])],
+        )
+    ]
+    stages += [
+        measure(
+            "_process_predictions",
+            n_predictions,
+            lambda: api._process_predictions(predictions),
+            repeat=repeat,
+        ),
+        measure(
+            "_format_predictions",
+            n_predictions,
+            lambda: api._format_predictions(predictions),
+            repeat=repeat,
+        ),
+        measure(
+            "get_forecast_as_plotly_json",
+            len(scoring_data),
+            lambda: api.get_forecast_as_plotly_json(scoring_data, display_length),
+            repeat=repeat,
+        ),
+        measure(
+            "get_explain_df",
+            n_predictions,
+            lambda: api.get_explain_df(predictions),
+            repeat=repeat,
+        ),
+        measure(
+            "get_rollup_forecast[build]",
+            n_predictions,
+            api.get_rollup_forecast,
+            reset=api.rollup_cache.clear,
+            repeat=repeat,
+        ),
+        measure(
+            "get_rollup_forecast[cube]",
+            n_predictions,
+            lambda: api.get_rollup_forecast(rollup_selection),
+            repeat=repeat,
+        ),
+    ]
+    return {
+        "scale": scale,
+        "series": int(scoring_frame[app_settings.multiseries_id_column].nunique()),
+        "scoring_rows": n_rows,
+        "displayed_scoring_rows": len(scoring_data),
+        "prediction_rows": n_predictions,
+        "stages": [asdict(stage) for stage in stages],
+    }
+
+
+def run_benchmark(
+    source: Path = DEFAULT_SOURCE,
+    scales: Sequence[int] = DEFAULT_SCALES,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """
+    Benchmark the backend stages on synthetic data at several scales.
+
+    Must run in a process that has not imported `forecastic.api` yet, since the
+    api is configured against the DataRobot stand-in at import time.
+
+    Parameters
+    ----------
+    source : Path
+        Scoring data CSV whose series are replicated.
+    scales : Sequence[int]
+        Multiples of the source series to benchmark.
+    repeat : int
+        Timed runs per stage; the fastest is reported.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Environment details and the per-stage results of every scale.
+    """
+    stand_in = DataRobotStandIn(BENCHMARK_APP_SETTINGS)
+    source_frame = pd.read_csv(source)
+    with tempfile.TemporaryDirectory(prefix="forecastic-benchmark-") as work_dir:
+        with _benchmark_api(Path(work_dir), stand_in) as api:
+            results: List[Dict[str, Any]] = [
+                _benchmark_scale(api, stand_in, source_frame, scale, repeat)
+                for scale in scales
+            ]
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "source": str(source),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m forecastic.benchmark",
+        description="Benchmark the forecastic backend on synthetic scoring data.",
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_SCALES),
+        help="Multiples of the source series to benchmark (default: 10 100 1000)",
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=DEFAULT_SOURCE,
+        help="Scoring data CSV to replicate (default: the bundled sample data)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per stage; the fastest is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the JSON report to this file instead of stdout",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat < 1 or any(scale < 1 for scale in args.scales):
+        parser.error("--scales and --repeat must be positive")
+
+    report = json.dumps(run_benchmark(args.source, args.scales, args.repeat), indent=2)
+    if args.output is None:
+        print(report)
+    else:
+        args.output.write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
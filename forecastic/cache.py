@@ -0,0 +1,588 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+cache_dir_env_name: str = "FORECAST_CACHE_DIR"
+disk_cache_enabled_env_name: str = "FORECAST_DISK_CACHE_ENABLED"
+scoring_data_ttl_env_name: str = "FORECAST_SCORING_DATA_TTL_SECONDS"
+prediction_cache_max_series_env_name: str = "FORECAST_PREDICTION_CACHE_MAX_SERIES"
+prediction_store_enabled_env_name: str = "FORECAST_PREDICTION_STORE_ENABLED"
+prediction_store_max_bytes_env_name: str = "FORECAST_PREDICTION_STORE_MAX_BYTES"
+metadata_ttl_env_name: str = "FORECAST_METADATA_TTL_SECONDS"
+
+# Keys looked up per SQLite statement, well below SQLite's host parameter limit
+SQLITE_BATCH_SIZE = 500
+
+T = TypeVar("T")
+
+
+class CacheSettings(BaseSettings):
+    """Establish local cache settings based upon env"""
+
+    cache_dir: Path = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + cache_dir_env_name,
+            cache_dir_env_name,
+        ),
+        default=Path(tempfile.gettempdir()) / "forecastic",
+    )
+    disk_cache_enabled: bool = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + disk_cache_enabled_env_name,
+            disk_cache_enabled_env_name,
+        ),
+        default=True,
+    )
+    scoring_data_ttl_seconds: float = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + scoring_data_ttl_env_name,
+            scoring_data_ttl_env_name,
+        ),
+        default=300,
+        ge=0,
+    )
+    prediction_cache_max_series: int = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_cache_max_series_env_name,
+            prediction_cache_max_series_env_name,
+        ),
+        default=10000,
+        ge=0,
+    )
+    prediction_store_enabled: bool = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_store_enabled_env_name,
+            prediction_store_enabled_env_name,
+        ),
+        default=False,
+    )
+    prediction_store_max_bytes: int = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_store_max_bytes_env_name,
+            prediction_store_max_bytes_env_name,
+        ),
+        default=512 * 1024 * 1024,
+        ge=0,
+    )
+    metadata_ttl_seconds: float = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + metadata_ttl_env_name,
+            metadata_ttl_env_name,
+        ),
+        default=300,
+        ge=0,
+    )
+
+
+class DatasetDiskCache:
+    """
+    On-disk copies of AI Catalog datasets stored as uncompressed Arrow IPC files.
+
+    Files are keyed by dataset id and version id, so a new dataset version is
+    downloaded once and every worker on the host afterwards memory-maps the
+    local copy instead of re-downloading and re-parsing the CSV.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir / "datasets"
+
+    def path(self, dataset_id: str, version_id: str) -> Path:
+        return self.cache_dir / f"{dataset_id}.{version_id}.arrow"
+
+    def load(self, dataset_id: str, version_id: str) -> Optional[pd.DataFrame]:
+        """Memory-map a cached dataset version, or return None if it is absent."""
+        path = self.path(dataset_id, version_id)
+        if not path.exists():
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (OSError, pa.ArrowException):
+            return None
+        return table.to_pandas()
+
+    def store(self, dataset_id: str, version_id: str, table: pa.Table) -> None:
+        """
+        Write a dataset version to the cache and drop older versions.
+
+        The file is written under a temporary name and renamed into place so
+        concurrent workers never read a partially written file. Write failures
+        leave the version uncached.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(dataset_id, version_id)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException):
+            tmp_path.unlink(missing_ok=True)
+            return
+        for stale_path in self.cache_dir.glob(f"{dataset_id}.*.arrow"):
+            if stale_path != path:
+                stale_path.unlink(missing_ok=True)
+
+
+class TTLCache(Generic[T]):
+    """
+    Thread-safe cache of remotely loaded objects that expire after a TTL.
+
+    Concurrent lookups of the same key wait for a single load. ``hits`` counts
+    the lookups served from the cache, i.e. the remote calls avoided, and
+    ``misses`` the lookups that had to load.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Tuple[float, T]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, load: Callable[[], T]) -> T:
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self._ttl_seconds:
+                with self._lock:
+                    self.hits += 1
+                return entry[1]
+            value = load()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), value)
+                self.misses += 1
+            return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent computations of the same keys.
+
+    Callers asking for keys that another caller is already computing wait for
+    that computation and share its result instead of repeating it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future[T]] = {}
+        self.requested = 0
+        self.computed = 0
+        self.coalesced = 0
+
+    def _claim(
+        self, keys: Iterable[str]
+    ) -> Tuple[Dict[str, Future[T]], Dict[str, Future[T]]]:
+        """Split keys into those this caller computes and those already in flight."""
+        owned: Dict[str, Future[T]] = {}
+        joined: Dict[str, Future[T]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._in_flight:
+                    joined[key] = self._in_flight[key]
+                elif key not in owned:
+                    owned[key] = self._in_flight[key] = Future()
+            self.requested += len(owned) + len(joined)
+            self.computed += len(owned)
+            self.coalesced += len(joined)
+        return owned, joined
+
+    def _settle(
+        self,
+        owned: Dict[str, Future[T]],
+        values: Dict[str, T],
+        error: Optional[BaseException],
+    ) -> None:
+        """
+        Hand a computation's outcome to its waiters and forget its keys.
+
+        Exceptions are shared with the waiters, but interruptions such as a
+        cancellation only concern the owner: its futures are cancelled after the
+        keys are released, so the waiters compute them instead.
+        """
+        try:
+            if error is None:
+                for key, future in owned.items():
+                    future.set_result(values[key])
+        except KeyError as e:
+            error = e
+            raise
+        finally:
+            with self._lock:
+                for key in owned:
+                    del self._in_flight[key]
+            for future in owned.values():
+                if future.done():
+                    continue
+                if isinstance(error, Exception):
+                    future.set_exception(error)
+                else:
+                    future.cancel()
+
+    def run(
+        self, keys: Iterable[str], compute: Callable[[List[str]], Dict[str, T]]
+    ) -> Dict[str, T]:
+        """
+        Compute the values of ``keys``, joining computations already in flight.
+
+        ``compute`` receives the keys no other caller is computing and returns
+        their values. Its exceptions are raised to every caller waiting on
+        those keys; if the computing caller is interrupted instead, the waiting
+        callers compute the keys again.
+        """
+        owned, joined = self._claim(keys)
+        try:
+            values = compute(list(owned)) if owned else {}
+        except BaseException as e:
+            self._settle(owned, {}, e)
+            raise
+        self._settle(owned, values, None)
+        abandoned = []
+        for key, future in joined.items():
+            try:
+                values[key] = future.result()
+            except CancelledError:
+                abandoned.append(key)
+        if abandoned:
+            values.update(self.run(abandoned, compute))
+        return values
+
+    async def run_async(
+        self,
+        keys: Iterable[str],
+        compute: Callable[[List[str]], Awaitable[Dict[str, T]]],
+    ) -> Dict[str, T]:
+        """
+        Async variant of `run` that awaits ``compute`` and joined computations.
+
+        Sync and async callers join each other's computations.
+        """
+        owned, joined = self._claim(keys)
+        try:
+            values = await compute(list(owned)) if owned else {}
+        except BaseException as e:
+            self._settle(owned, {}, e)
+            raise
+        self._settle(owned, values, None)
+        abandoned = []
+        for key, future in joined.items():
+            try:
+                # Shielded so a cancelled caller does not cancel the other
+                # callers' future
+                values[key] = await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                abandoned.append(key)
+        if abandoned:
+            values.update(await self.run_async(abandoned, compute))
+        return values
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requested": self.requested,
+                "computed": self.computed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+
+class PredictionStore:
+    """
+    Predictions per series persisted in a SQLite database.
+
+    Entries are keyed by the content hash of a series' scoring rows salted with
+    the deployment and model id, so all workers on a host share predictions
+    across restarts. Records are stored as compressed JSON and, once the
+    store outgrows ``max_bytes``, the least recently used entries are evicted.
+    Database errors are treated as cache misses.
+    """
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        self.path = path
+        self._max_bytes = max_bytes
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, deployment_id TEXT NOT NULL, "
+                "model_id TEXT NOT NULL, records BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS predictions_accessed_at "
+                "ON predictions (accessed_at)"
+            )
+            # Running total of the stored sizes, so writes need not sum the table
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS store_size ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "total_bytes INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO store_size (id, total_bytes) "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM predictions"
+            )
+            connection.commit()
+            self._initialized = True
+        return connection
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, list[dict[str, Any]]]:
+        """Return the stored predictions among ``keys`` and mark them as used."""
+        keys = list(keys)
+        found = {}
+        try:
+            with contextlib.closing(self._connect()) as connection, connection:
+                for start in range(0, len(keys), SQLITE_BATCH_SIZE):
+                    batch = keys[start : start + SQLITE_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = connection.execute(
+                        "SELECT key, records FROM predictions "
+                        f"WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchall()
+                    for key, records in rows:
+                        found[key] = json.loads(zlib.decompress(records))
+                    connection.execute(
+                        "UPDATE predictions SET accessed_at = ? "
+                        f"WHERE key IN ({placeholders})",
+                        [time.time(), *batch],
+                    )
+        except (OSError, sqlite3.Error, zlib.error, ValueError):
+            return {}
+        return found
+
+    def put_many(
+        self,
+        deployment_id: str,
+        model_id: str,
+        records_by_key: Dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Store predictions and evict the least recently used beyond the size limit."""
+        now = time.time()
+        rows = []
+        for key, records in records_by_key.items():
+            try:
+                blob = zlib.compress(json.dumps(records).encode(), 1)
+            except (TypeError, ValueError):
+                # Values JSON cannot represent are only cached in memory
+                continue
+            rows.append((key, deployment_id, model_id, blob, len(blob), now))
+        try:
+            with contextlib.closing(self._connect()) as connection, connection:
+                # Take the write lock first, so the size total stays consistent
+                connection.execute("BEGIN IMMEDIATE")
+                replaced_bytes = 0
+                for start in range(0, len(rows), SQLITE_BATCH_SIZE):
+                    batch = [row[0] for row in rows[start : start + SQLITE_BATCH_SIZE]]
+                    placeholders = ",".join("?" * len(batch))
+                    replaced_bytes += connection.execute(
+                        "SELECT COALESCE(SUM(size), 0) FROM predictions "
+                        f"WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchone()[0]
+                connection.executemany(
+                    "INSERT OR REPLACE INTO predictions "
+                    "(key, deployment_id, model_id, records, size, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "UPDATE store_size SET total_bytes = total_bytes + ? WHERE id = 0",
+                    (sum(row[4] for row in rows) - replaced_bytes,),
+                )
+                total_bytes = connection.execute(
+                    "SELECT total_bytes FROM store_size WHERE id = 0"
+                ).fetchone()[0]
+                if total_bytes > self._max_bytes:
+                    self._evict(connection, total_bytes)
+        except (OSError, sqlite3.Error):
+            return
+
+    def _evict(self, connection: sqlite3.Connection, total_bytes: int) -> None:
+        """Delete the least recently used entries until the store fits its limit."""
+        evicted_bytes = 0
+        while total_bytes - evicted_bytes > self._max_bytes:
+            oldest = connection.execute(
+                "SELECT key, size FROM predictions ORDER BY accessed_at, key LIMIT ?",
+                (SQLITE_BATCH_SIZE,),
+            ).fetchall()
+            if not oldest:
+                break
+            keys = []
+            for key, size in oldest:
+                if total_bytes - evicted_bytes <= self._max_bytes:
+                    break
+                keys.append(key)
+                evicted_bytes += size
+            placeholders = ",".join("?" * len(keys))
+            connection.execute(
+                f"DELETE FROM predictions WHERE key IN ({placeholders})", keys
+            )
+        connection.execute(
+            "UPDATE store_size SET total_bytes = total_bytes - ? WHERE id = 0",
+            (evicted_bytes,),
+        )
+
+
+class RefreshingCache(Generic[T]):
+    """
+    Single value cache that revalidates itself in the background.
+
+    ``load`` receives the currently cached version (None before the first load)
+    and returns None when that version is still the latest, or the new version
+    together with its value. The first ``get`` loads synchronously. Once the TTL
+    has expired, the next ``get`` starts a revalidation thread and keeps
+    returning the cached value until a newer one has been loaded.
+    ``on_replace`` is called with the previous and the new value once a newer
+    value has replaced a cached one.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Optional[str]], Optional[Tuple[str, T]]],
+        ttl_seconds: float,
+        on_replace: Optional[Callable[[T, T], None]] = None,
+    ) -> None:
+        self._load = load
+        self._ttl_seconds = ttl_seconds
+        self._on_replace = on_replace
+        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[str, T]] = None
+        self._checked_at = 0.0
+        self._refreshing = False
+
+    def get(self) -> T:
+        with self._lock:
+            if self._entry is None:
+                self._entry = self._load(None)
+                self._checked_at = time.monotonic()
+            elif (
+                not self._refreshing
+                and time.monotonic() - self._checked_at >= self._ttl_seconds
+            ):
+                self._refreshing = True
+                threading.Thread(
+                    target=self._refresh, name="forecastic-cache-refresh", daemon=True
+                ).start()
+            assert self._entry is not None
+            return self._entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry = None
+
+    def _refresh(self) -> None:
+        try:
+            entry = self._entry
+            new_entry = self._load(entry[0] if entry is not None else None)
+            with self._lock:
+                if new_entry is None or self._entry is not entry:
+                    return
+                self._entry = new_entry
+            # Outside the lock, so that the callback may use the cache
+            if entry is not None and self._on_replace is not None:
+                self._on_replace(entry[1], new_entry[1])
+        except Exception:
+            # Keep serving the cached value and try again once the TTL expires
+            logger.warning("Unable to refresh cached value", exc_info=True)
+        finally:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                self._refreshing = False
+
+
+class LRUCache(Generic[T]):
+    """Thread-safe mapping that evicts its least recently used entries."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, T] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, T]:
+        """Return the cached entries among ``keys`` and mark them as used."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        return found
+
+    def put(self, key: str, value: T) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
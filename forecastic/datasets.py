@@ -0,0 +1,172 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import io
+import logging
+from typing import Any, Callable, Iterable, Optional
+
+import datarobot as dr
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Bytes of CSV parsed into each Arrow record batch
+DOWNLOAD_BLOCK_SIZE = 16 * 1024 * 1024
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class _ProgressReader(io.RawIOBase):
+    """Binary stream wrapper that reports how many bytes have been read."""
+
+    def __init__(
+        self, stream: Any, total_bytes: Optional[int], progress: ProgressCallback
+    ) -> None:
+        self._stream = stream
+        self._total_bytes = total_bytes
+        self._progress = progress
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        chunk = self._stream.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        self.bytes_read += len(chunk)
+        self._progress(self.bytes_read, self._total_bytes)
+        return len(chunk)
+
+
+def log_download_progress(dataset_id: str) -> ProgressCallback:
+    """Progress callback that logs every additional 10% of a download."""
+    last_logged = [-1]
+
+    def progress(bytes_read: int, total_bytes: Optional[int]) -> None:
+        if not total_bytes:
+            return
+        decile = min(10, bytes_read * 10 // total_bytes)
+        if decile > last_logged[0]:
+            last_logged[0] = decile
+            logger.info(
+                "Downloaded %d%% of dataset %s (%d of %d bytes)",
+                decile * 10,
+                dataset_id,
+                bytes_read,
+                total_bytes,
+            )
+
+    return progress
+
+
+def read_csv_stream(
+    stream: io.RawIOBase,
+    string_columns: Iterable[str] = (),
+    block_size: int = DOWNLOAD_BLOCK_SIZE,
+) -> pa.Table:
+    """
+    Parse a CSV (or Parquet) byte stream into an Arrow table block by block.
+
+    Only one block of raw bytes is held at a time. Types are inferred from the
+    first block like pandas would: ``string_columns`` and columns Arrow would
+    read as dates, times or timestamps are kept as text.
+    """
+    buffered = io.BufferedReader(stream, buffer_size=block_size)
+    if buffered.peek(4).startswith(b"PAR1"):
+        return pq.read_table(io.BytesIO(buffered.read()))
+    read_options = pa_csv.ReadOptions(block_size=block_size)
+    text_columns = [
+        *string_columns,
+        *_infer_temporal_columns(buffered.peek(block_size)),
+    ]
+    reader = pa_csv.open_csv(
+        buffered,
+        read_options=read_options,
+        convert_options=pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in text_columns},
+            strings_can_be_null=True,
+        ),
+    )
+    return pa.Table.from_batches(list(reader), schema=reader.schema)
+
+
+def _infer_temporal_columns(sample: bytes) -> list[str]:
+    """Columns of a CSV sample whose inferred Arrow type is temporal."""
+    # Only complete lines, so a value cut off by the sample is not misread
+    end = sample.rfind(b"\n")
+    if end < 0:
+        return []
+    try:
+        schema = pa_csv.open_csv(io.BytesIO(sample[: end + 1])).schema
+    except pa.ArrowInvalid:
+        return []
+    return [field.name for field in schema if pa.types.is_temporal(field.type)]
+
+
+def download_dataset_table(
+    dataset: dr.Dataset,
+    string_columns: Iterable[str] = (),
+    progress: Optional[ProgressCallback] = None,
+) -> pa.Table:
+    """
+    Stream an AI Catalog dataset version into an Arrow table.
+
+    Unlike `dr.Dataset.get_as_dataframe`, the file is never held in memory as a
+    whole, so peak memory stays close to the size of the resulting table.
+    """
+    response = dr.client.get_client().get(_get_file_path(dataset), stream=True)
+    try:
+        response.raw.decode_content = True
+        total_bytes = response.headers.get("Content-Length")
+        return read_csv_stream(
+            _ProgressReader(
+                response.raw,
+                int(total_bytes) if total_bytes is not None else dataset.size,
+                progress or log_download_progress(dataset.id),
+            ),
+            string_columns,
+        )
+    finally:
+        response.close()
+
+
+def download_dataset_frame(dataset: dr.Dataset) -> pd.DataFrame:
+    """
+    Download an AI Catalog dataset version into a DataFrame with pandas.
+
+    For files whose column types Arrow cannot infer from the first block.
+    """
+    response = dr.client.get_client().get(_get_file_path(dataset), stream=True)
+    try:
+        response.raw.decode_content = True
+        content = response.raw.read()
+    finally:
+        response.close()
+    if content.startswith(b"PAR1"):
+        return pd.read_parquet(io.BytesIO(content))
+    return pd.read_csv(io.BytesIO(content))
+
+
+def _get_file_path(dataset: dr.Dataset) -> str:
+    """
+    File of the dataset version that was looked up.
+
+    ``datasets/{id}/file/`` serves the latest version, which may already be
+    newer than ``dataset.version_id``.
+    """
+    return f"datasets/{dataset.id}/versions/{dataset.version_id}/file/"
@@ -0,0 +1,164 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings
+
+from forecastic.datasets import read_csv_stream
+from forecastic.frames import compact_frame
+from forecastic.index import SeriesIndex
+
+logger = logging.getLogger(__name__)
+
+batch_predictions_path_env_name: str = "FORECAST_BATCH_PREDICTIONS_PATH"
+
+FORECAST_POINT_COLUMN = "FORECAST_POINT"
+FORECAST_DISTANCE_COLUMN = "FORECAST_DISTANCE"
+
+
+class ForecastStoreSettings(BaseSettings):
+    """Establish forecast store settings based upon env"""
+
+    batch_predictions_path: Optional[Path] = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + batch_predictions_path_env_name,
+            batch_predictions_path_env_name,
+        ),
+        default=None,
+    )
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    """Parse timestamps to timezone naive UTC so forecast points can be compared."""
+    timestamps = pd.to_datetime(values, errors="coerce", utc=True)
+    return timestamps.dt.tz_localize(None)
+
+
+class ForecastStore:
+    """
+    Forecasts written by the scheduled batch prediction job, indexed by series.
+
+    Only the rows of each series' latest forecast point are kept. A series is
+    served from the store as long as its stored forecast point is the one the
+    current scoring data implies; otherwise it has to be predicted again.
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        series_index: SeriesIndex,
+        series_column: str,
+        forecast_points: pd.Series,
+    ) -> None:
+        self.frame = frame
+        self.series_index = series_index
+        self.series_column = series_column
+        self.forecast_points = forecast_points
+
+    @classmethod
+    def from_frame(cls, predictions: pd.DataFrame, series_column: str) -> ForecastStore:
+        timestamps = _parse_timestamps(predictions[FORECAST_POINT_COLUMN])
+        latest = timestamps.groupby(predictions[series_column], sort=False).transform(
+            "max"
+        )
+        keep = (timestamps == latest).to_numpy()
+        frame = predictions[keep].sort_values(
+            [series_column, FORECAST_DISTANCE_COLUMN], kind="stable"
+        )
+        frame, _ = compact_frame(frame.reset_index(drop=True), [series_column])
+        forecast_points = (
+            timestamps[keep]
+            .groupby(predictions.loc[keep, series_column], sort=False)
+            .max()
+        )
+        return cls(
+            frame,
+            SeriesIndex.from_frame(frame, [series_column]),
+            series_column,
+            forecast_points,
+        )
+
+    def __len__(self) -> int:
+        return len(self.forecast_points)
+
+    @property
+    def has_explanations(self) -> bool:
+        return any(column.startswith("EXPLANATION_") for column in self.frame.columns)
+
+    def get_records(
+        self, forecast_points: pd.Series
+    ) -> Dict[Any, list[dict[str, Any]]]:
+        """
+        Stored forecasts of the series whose forecast point is still current.
+
+        Parameters
+        ----------
+        forecast_points : pd.Series
+            Current forecast point of every requested series, indexed by series id.
+
+        Returns
+        -------
+        Dict[Any, list[dict[str, Any]]]
+            Prediction records by series id, for the requested series found in
+            the store with a matching forecast point.
+        """
+        stored_points = self.forecast_points.reindex(forecast_points.index)
+        current = forecast_points.index[(stored_points == forecast_points).to_numpy()]
+        positions = self.series_index.positions[self.series_column]
+        return {
+            series: self.frame.take(positions[series]).to_dict(orient="records")
+            for series in current
+        }
+
+
+def load_forecast_store(
+    path: Path,
+    series_column: str,
+    string_columns: Tuple[str, ...],
+    loaded_version: Optional[str],
+) -> Optional[Tuple[str, Optional[ForecastStore]]]:
+    """
+    Read the batch prediction job output at ``path`` unless it is unchanged.
+
+    The file version is its modification time and size. A missing or
+    unreadable file yields no store, so every series is predicted in real time.
+    """
+    try:
+        stat = path.stat()
+        version = f"{stat.st_mtime_ns}-{stat.st_size}"
+    except OSError:
+        version = "missing"
+    if version == loaded_version:
+        return None
+    if version == "missing":
+        logger.warning("Batch predictions file %s not found", path)
+        return version, None
+    try:
+        with open(path, "rb", buffering=0) as stream:
+            table = read_csv_stream(
+                stream, string_columns=(*string_columns, FORECAST_POINT_COLUMN)
+            )
+        store = ForecastStore.from_frame(table.to_pandas(), series_column)
+    except (OSError, KeyError, pa.ArrowException) as e:
+        logger.warning("Unable to read batch predictions file %s: %s", path, e)
+        return version, None
+    logger.info("Loaded batch forecasts of %d series from %s", len(store), path)
+    return version, store
@@ -0,0 +1,200 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas.api.types import (
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _compact_column(series: pd.Series, as_category: bool) -> pd.Series:
+    """Return the most compact lossless representation of a column."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    if is_object_dtype(series.dtype) or is_string_dtype(series.dtype):
+        if as_category or series.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+            return series.astype("category")
+        return series
+    if is_integer_dtype(series.dtype) and not isinstance(
+        series.dtype, pd.api.extensions.ExtensionDtype
+    ):
+        return pd.to_numeric(series, downcast="integer")
+    if is_float_dtype(series.dtype) and series.dtype == np.float64:
+        downcast = series.astype(np.float32)
+        if np.array_equal(
+            downcast.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True
+        ):
+            return downcast
+    return series
+
+
+def compact_frame(
+    df: pd.DataFrame, category_columns: Iterable[str]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Shrink the in-memory footprint of a frame without changing its values.
+
+    ``category_columns`` and low-cardinality text columns become categoricals,
+    integers are downcast to the smallest integer type holding their range and
+    float64 columns become float32 where every value survives the round trip.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        The compacted frame and a per-column report of dtypes and memory usage
+        in bytes before and after compaction.
+    """
+    category_columns = set(category_columns)
+    compacted = pd.DataFrame(
+        {
+            column: _compact_column(df[column], column in category_columns)
+            for column in df.columns
+        },
+        index=df.index,
+    )
+    report = pd.DataFrame(
+        {
+            "dtype_before": df.dtypes.astype(str),
+            "dtype_after": compacted.dtypes.astype(str),
+            "bytes_before": df.memory_usage(index=False, deep=True),
+            "bytes_after": compacted.memory_usage(index=False, deep=True),
+        }
+    )
+    return compacted, report
+
+
+def parse_datetime_column(series: pd.Series, date_format: str) -> pd.Series:
+    """
+    Parse a date column, converting each distinct value only once.
+
+    Values that do not match ``date_format`` become NaT.
+    """
+    categorical = series.astype("category")
+    categories = pd.DatetimeIndex(
+        pd.to_datetime(categorical.cat.categories, format=date_format, errors="coerce")
+    )
+    timestamps = categories.take(
+        categorical.cat.codes.to_numpy(), allow_fill=True, fill_value=pd.NaT
+    )
+    return pd.Series(timestamps, index=series.index, name=series.name)
+
+
+def get_forecast_point(
+    timestamps: pd.Series, known: pd.Series
+) -> Optional[pd.Timestamp]:
+    """
+    Latest timestamp with a ``known`` target across all rows, if any.
+
+    DataRobot uses one forecast point for all series of a prediction request,
+    the latest one with a known target.
+    """
+    forecast_point = pd.to_datetime(timestamps)[known.to_numpy(dtype=bool)].max()
+    return None if pd.isna(forecast_point) else pd.Timestamp(forecast_point)
+
+
+def window_dates(
+    timestamps: pd.Series,
+    known: pd.Series,
+    history_length: int,
+    forecast_length: Optional[int] = None,
+    forecast_point: Optional[pd.Timestamp] = None,
+) -> npt.NDArray[np.bool_]:
+    """
+    Select the rows in a window of dates around a shared forecast point.
+
+    The forecast point defaults to `get_forecast_point` of the rows. The
+    ``history_length`` most recent distinct dates up to and including it are
+    kept, along with the first ``forecast_length`` distinct dates after it
+    (all of them when None). The cutoffs are the same for every series, so
+    totals over the series of a window never mix dates some series lack
+    because they end earlier. Rows without a timestamp are always kept, and
+    every row is kept when there is no forecast point.
+
+    Returns
+    -------
+    npt.NDArray[np.bool_]
+        Mask over the rows in their original order.
+    """
+    values = pd.to_datetime(timestamps).to_numpy()
+    mask = np.ones(len(values), dtype=bool)
+    if forecast_point is None:
+        forecast_point = get_forecast_point(timestamps, known)
+    if forecast_point is None:
+        return mask
+    missing = np.isnat(values)
+    dates = np.unique(values[~missing])
+    # Number of dates up to and including the forecast point
+    position = int(np.searchsorted(dates, forecast_point.to_datetime64(), "right"))
+    if position > history_length:
+        mask &= values >= dates[position - history_length]
+    if forecast_length is not None and position + forecast_length < len(dates):
+        mask &= values < dates[position + forecast_length]
+    window: npt.NDArray[np.bool_] = mask | missing
+    return window
+
+
+def _widen_column(series: pd.Series) -> pd.Series:
+    """Return a column in the dtype its values would have without compaction."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = pd.Series(series.to_numpy(), index=series.index, name=series.name)
+    if is_integer_dtype(series.dtype) and not isinstance(
+        series.dtype, pd.api.extensions.ExtensionDtype
+    ):
+        return series if series.dtype == np.uint64 else series.astype(np.int64)
+    if is_float_dtype(series.dtype) and series.dtype != np.float64:
+        return series.astype(np.float64)
+    return series
+
+
+def hash_series(df: pd.DataFrame, series_column: str, salt: str = "") -> pd.Series:
+    """
+    Content hash of the rows of every series.
+
+    Rows are hashed column by column in a vectorized pass and each series'
+    row hashes are then digested in row order together with the column names
+    and ``salt``, so a series keeps its hash for as long as its rows do,
+    whichever other series it is requested with. Values are hashed in the
+    dtypes `compact_frame` narrows them from, so a compacted frame hashes like
+    its records do.
+
+    Returns
+    -------
+    pd.Series
+        Hex digest per series, indexed by series id in order of first appearance.
+    """
+    columns = sorted(df.columns)
+    widened = pd.DataFrame({column: _widen_column(df[column]) for column in columns})
+    row_hashes = pd.util.hash_pandas_object(widened, index=False).to_numpy()
+    header = "\0".join([salt, *columns]).encode()
+    codes, series_ids = pd.factorize(df[series_column])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(series_ids) + 1))
+    digests = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        digest = hashlib.sha256(header)
+        digest.update(row_hashes[order[start:end]].tobytes())
+        digests.append(digest.hexdigest())
+    return pd.Series(digests, index=series_ids, dtype=object)
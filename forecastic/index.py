@@ -0,0 +1,236 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from forecastic.schema import FilterSpec
+
+
+class SeriesIndex:
+    """
+    Inverted index from the values of filterable columns to row positions.
+
+    Built once per scoring data load so that a filter selection is resolved by
+    set operations over precomputed position arrays rather than by scanning
+    every row of the frame for every filter.
+    """
+
+    def __init__(self, positions: Dict[str, Dict[Any, npt.NDArray[np.intp]]]) -> None:
+        self.positions = positions
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str]) -> SeriesIndex:
+        positions: Dict[str, Dict[Any, npt.NDArray[np.intp]]] = {}
+        for column in dict.fromkeys(columns):
+            codes, uniques = pd.factorize(df[column])
+            # Stable sort keeps the row positions of each value in frame order
+            order = np.argsort(codes, kind="stable").astype(np.intp)
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            positions[column] = {
+                value: order[bounds[i] : bounds[i + 1]]
+                for i, value in enumerate(uniques)
+            }
+        return cls(positions)
+
+    def __contains__(self, column: object) -> bool:
+        return column in self.positions
+
+    def select(
+        self, filter_selection: List[FilterSpec]
+    ) -> Optional[npt.NDArray[np.intp]]:
+        """
+        Resolve filters on indexed columns to sorted row positions.
+
+        Values within a filter are combined with OR and filters are combined
+        with AND, matching successive ``isin`` masks. Filters without selected
+        values are ignored; None is returned when no filter applies.
+        """
+        selected: Optional[npt.NDArray[np.intp]] = None
+        for widget in filter_selection:
+            if len(widget.selected_values) == 0:
+                continue
+            value_positions = self.positions[widget.column]
+            matches = [
+                value_positions[value]
+                for value in set(widget.selected_values)
+                if value in value_positions
+            ]
+            rows = (
+                np.sort(np.concatenate(matches))
+                if matches
+                else np.empty(0, dtype=np.intp)
+            )
+            selected = (
+                rows
+                if selected is None
+                else np.intersect1d(selected, rows, assume_unique=True)
+            )
+        return selected
+
+
+class FilterHierarchy:
+    """
+    Distinct combinations of filter column values present in the scoring data.
+
+    The table has one row per combination (roughly one per series), so the
+    options that remain valid for a partial filter selection are found without
+    touching the full frame.
+    """
+
+    def __init__(self, combinations: pd.DataFrame) -> None:
+        self.combinations = combinations
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str]) -> FilterHierarchy:
+        combinations = (
+            df[list(dict.fromkeys(columns))].drop_duplicates().reset_index(drop=True)
+        )
+        return cls(combinations)
+
+    def valid_values(
+        self, filter_selection: Optional[List[FilterSpec]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Options of every filter column that can still produce data.
+
+        Each column is narrowed by the selections made on the other columns
+        only, so the values already selected in a column stay available.
+        Options keep the order in which they first appear in the data.
+        """
+        masks = {
+            widget.column: self.combinations[widget.column]
+            .isin(widget.selected_values)
+            .to_numpy()
+            for widget in filter_selection or []
+            if len(widget.selected_values) > 0 and widget.column in self.combinations
+        }
+        valid_values = {}
+        for column in self.combinations.columns:
+            mask = np.ones(len(self.combinations), dtype=bool)
+            for other_column, other_mask in masks.items():
+                if other_column != column:
+                    mask &= other_mask
+            valid_values[column] = self.combinations.loc[mask, column].unique().tolist()
+        return valid_values
+
+
+class RollupCube:
+    """
+    Forecast totals by date for every combination of the leading hierarchy columns.
+
+    Level ``d`` holds the summed values of every distinct combination of the
+    first ``d`` columns (level 0 being the grand total), one vector per date
+    and value column. Built once per forecast refresh, so the totals of a
+    selection are the sum of the few matching vectors of the deepest selected
+    level instead of a group-by over every forecast row.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        date_column: str,
+        value_columns: List[str],
+        dates: npt.NDArray[np.object_],
+        keys: List[pd.DataFrame],
+        totals: List[npt.NDArray[np.float64]],
+        counts: List[npt.NDArray[np.intp]],
+    ) -> None:
+        self.columns = columns
+        self.date_column = date_column
+        self.value_columns = value_columns
+        self.dates = dates
+        self.keys = keys
+        self.totals = totals
+        self.counts = counts
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        columns: Iterable[str],
+        date_column: str,
+        value_columns: List[str],
+    ) -> RollupCube:
+        columns = list(dict.fromkeys(columns))
+        date_codes, dates = pd.factorize(df[date_column], sort=True)
+        n_dates = len(dates)
+        # Missing values do not add to a total, like in a group-by sum
+        values = df[value_columns].fillna(0).to_numpy(dtype=np.float64)
+        cell_codes = np.zeros(len(df), dtype=np.intp)
+        keys: List[pd.DataFrame] = []
+        totals: List[npt.NDArray[np.float64]] = []
+        counts: List[npt.NDArray[np.intp]] = []
+        for depth in range(len(columns) + 1):
+            if depth > 0:
+                codes, uniques = pd.factorize(
+                    df[columns[depth - 1]], use_na_sentinel=False
+                )
+                # Cells of a level are numbered in order of first appearance
+                cell_codes = pd.factorize(cell_codes * len(uniques) + codes)[0]
+            _, first_rows = np.unique(cell_codes, return_index=True)
+            n_cells = len(first_rows)
+            flat_codes = cell_codes * n_dates + date_codes
+            keys.append(df[columns[:depth]].iloc[first_rows].reset_index(drop=True))
+            level_totals = np.zeros((n_cells * n_dates, len(value_columns)))
+            for i in range(len(value_columns)):
+                level_totals[:, i] = np.bincount(
+                    flat_codes, weights=values[:, i], minlength=n_cells * n_dates
+                )
+            totals.append(level_totals.reshape(n_cells, n_dates, len(value_columns)))
+            counts.append(
+                np.bincount(flat_codes, minlength=n_cells * n_dates).reshape(
+                    n_cells, n_dates
+                )
+            )
+        return cls(
+            columns,
+            date_column,
+            value_columns,
+            np.asarray(dates, dtype=object),
+            keys,
+            totals,
+            counts,
+        )
+
+    def total(self, filter_selection: List[FilterSpec]) -> Optional[pd.DataFrame]:
+        """
+        Totals by date of the rows matching a filter selection.
+
+        Filters combine like in `SeriesIndex.select`, and only dates with at
+        least one matching row are returned. None is returned when a filter
+        is on a column outside the hierarchy.
+        """
+        selected = [
+            widget for widget in filter_selection if len(widget.selected_values) > 0
+        ]
+        if any(widget.column not in self.columns for widget in selected):
+            return None
+        depth = max(
+            (self.columns.index(widget.column) + 1 for widget in selected), default=0
+        )
+        keys = self.keys[depth]
+        mask = np.ones(len(keys), dtype=bool)
+        for widget in selected:
+            mask &= keys[widget.column].isin(widget.selected_values).to_numpy()
+        present = self.counts[depth][mask].sum(axis=0) > 0
+        totals = pd.DataFrame(
+            self.totals[depth][mask].sum(axis=0)[present], columns=self.value_columns
+        )
+        totals.insert(0, self.date_column, self.dates[present])
+        return totals
@@ -0,0 +1,478 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import logging
+import math
+import os
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Union
+
+import datarobot as dr
+import httpx
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from datarobot.errors import ClientError, ServerError
+from datarobot_predict.deployment import (
+    REQUEST_LIMIT_BYTES,
+    REQUEST_MAX_RETRY,
+    REQUEST_RETRY_MAX_DELAY,
+    REQUEST_RETRY_SLEEP,
+    REQUEST_RETRYABLE_STATUS_CODES,
+    PredictionResult,
+)
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+prediction_max_workers_env_name: str = "FORECAST_PREDICTION_MAX_WORKERS"
+prediction_shard_rows_env_name: str = "FORECAST_PREDICTION_SHARD_ROWS"
+http_max_connections_env_name: str = "FORECAST_HTTP_MAX_CONNECTIONS"
+reforecast_changed_series_env_name: str = "FORECAST_REFORECAST_CHANGED_SERIES"
+prediction_upload_compression_env_name: str = "FORECAST_PREDICTION_UPLOAD_COMPRESSION"
+prediction_upload_compression_level_env_name: str = (
+    "FORECAST_PREDICTION_UPLOAD_COMPRESSION_LEVEL"
+)
+
+# Smallest shard worth a separate prediction request
+MIN_SHARD_ROWS = 1000
+
+# Same request timeout as `datarobot_predict.deployment.predict`
+PREDICTION_TIMEOUT_SECONDS = 600
+
+
+class PredictionSettings(BaseSettings):
+    """Establish real-time prediction settings based upon env"""
+
+    max_workers: int = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_max_workers_env_name,
+            prediction_max_workers_env_name,
+        ),
+        default=4,
+        ge=1,
+    )
+    shard_rows: int = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_shard_rows_env_name,
+            prediction_shard_rows_env_name,
+        ),
+        default=50000,
+        ge=1,
+    )
+    http_max_connections: int = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + http_max_connections_env_name,
+            http_max_connections_env_name,
+        ),
+        default=20,
+        ge=1,
+    )
+    reforecast_changed_series: bool = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + reforecast_changed_series_env_name,
+            reforecast_changed_series_env_name,
+        ),
+        default=True,
+    )
+    # Opt-in, as not every prediction route is known to accept compressed bodies
+    upload_compression: Literal["none", "gzip"] = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_upload_compression_env_name,
+            prediction_upload_compression_env_name,
+        ),
+        default="none",
+    )
+    # The fastest level already removes most of the redundancy of CSV text
+    upload_compression_level: int = Field(
+        validation_alias=AliasChoices(
+            "MLOPS_RUNTIME_PARAM_" + prediction_upload_compression_level_env_name,
+            prediction_upload_compression_level_env_name,
+        ),
+        default=1,
+        ge=1,
+        le=9,
+    )
+
+
+def shard_series(series_ids: pd.Series, max_rows: int) -> List[npt.NDArray[np.intp]]:
+    """
+    Split rows into shards of whole series.
+
+    Series are packed in order of first appearance into shards of at most
+    ``max_rows`` rows; a series with more rows than that gets a shard of its
+    own.
+
+    Returns
+    -------
+    List[npt.NDArray[np.intp]]
+        Row positions of every shard, in their original order.
+    """
+    codes, series = pd.factorize(series_ids, use_na_sentinel=False)
+    shard_of_series = np.empty(len(series), dtype=np.intp)
+    shard, shard_rows = 0, 0
+    for i, rows in enumerate(np.bincount(codes, minlength=len(series))):
+        if shard_rows > 0 and shard_rows + rows > max_rows:
+            shard, shard_rows = shard + 1, 0
+        shard_of_series[i] = shard
+        shard_rows += rows
+    if len(series) == 0:
+        return []
+    row_shards = shard_of_series[codes]
+    order = np.argsort(row_shards, kind="stable").astype(np.intp)
+    bounds = np.searchsorted(row_shards[order], np.arange(shard + 2))
+    return [order[bounds[i] : bounds[i + 1]] for i in range(shard + 1)]
+
+
+def _max_shard_rows(rows: int, settings: PredictionSettings) -> int:
+    """Shard size giving every worker a share of ``rows`` within the limits."""
+    return min(
+        settings.shard_rows,
+        max(MIN_SHARD_ROWS, math.ceil(rows / settings.max_workers)),
+    )
+
+
+def predict_in_shards(
+    predict: Callable[[pd.DataFrame], pd.DataFrame],
+    df: pd.DataFrame,
+    series_column: str,
+    settings: PredictionSettings,
+    executor: Executor,
+) -> pd.DataFrame:
+    """
+    Predict a frame in concurrent requests of whole series.
+
+    Shards hold about an equal share of the rows per worker, but at least
+    `MIN_SHARD_ROWS` and never more than the configured shard size. Results are
+    concatenated in shard order, so series keep their order of first
+    appearance.
+    """
+    shards = shard_series(df[series_column], _max_shard_rows(len(df), settings))
+    if len(shards) <= 1:
+        return predict(df)
+    futures = [
+        executor.submit(predict, df.take(rows).reset_index(drop=True))
+        for rows in shards
+    ]
+    return pd.concat([future.result() for future in futures], ignore_index=True)
+
+
+async def predict_in_shards_async(
+    predict: Callable[[pd.DataFrame], Awaitable[pd.DataFrame]],
+    df: pd.DataFrame,
+    series_column: str,
+    settings: PredictionSettings,
+) -> pd.DataFrame:
+    """
+    Async variant of `predict_in_shards`.
+
+    At most ``settings.max_workers`` shards of one frame are predicted at a
+    time; the connection pool of the async HTTP client bounds the requests of
+    all frames together.
+    """
+    shards = shard_series(df[series_column], _max_shard_rows(len(df), settings))
+    if len(shards) <= 1:
+        return await predict(df)
+    semaphore = asyncio.Semaphore(settings.max_workers)
+
+    async def predict_shard(rows: npt.NDArray[np.intp]) -> pd.DataFrame:
+        async with semaphore:
+            return await predict(df.take(rows).reset_index(drop=True))
+
+    results = await asyncio.gather(*(predict_shard(rows) for rows in shards))
+    return pd.concat(results, ignore_index=True)
+
+
+_async_http_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client(settings: PredictionSettings) -> httpx.AsyncClient:
+    """
+    Pooled async HTTP client of the running event loop.
+
+    Connections are bound to the event loop that opened them, so every loop
+    gets a client of its own, created on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=_get_ssl_verify(),
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections,
+            ),
+            timeout=PREDICTION_TIMEOUT_SECONDS,
+        )
+        _async_http_clients[loop] = client
+    return client
+
+
+def _get_ssl_verify() -> Union[bool, ssl.SSLContext]:
+    """TLS verification of the DataRobot client, as httpx expects it."""
+    verify = dr.client.get_client().verify
+    if isinstance(verify, str):
+        # A CA bundle file or directory, as accepted by requests
+        if os.path.isdir(verify):
+            return ssl.create_default_context(capath=verify)
+        return ssl.create_default_context(cafile=verify)
+    return bool(verify)
+
+
+async def close_async_http_client() -> None:
+    """Close the async HTTP client of the running event loop, if any."""
+    client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _get_prediction_request(deployment: dr.Deployment) -> Tuple[str, Dict[str, str]]:
+    """URL and authentication headers of a deployment's prediction requests."""
+    client = dr.client.get_client()
+    headers = {
+        key: value.decode() if isinstance(value, bytes) else value
+        for key, value in client.headers.items()
+    }
+    path = f"deployments/{deployment.id}/predictions"
+    if "datarobot-nginx" in os.environ.get("DATAROBOT_ENDPOINT", ""):
+        return f"http://datarobot-prediction-server:80/predApi/v1.0/{path}", headers
+    prediction_server = deployment.default_prediction_server
+    if prediction_server:
+        datarobot_key = prediction_server.get("datarobot-key")
+        if datarobot_key:
+            headers["datarobot-key"] = datarobot_key
+        return f"{prediction_server['url']}/predApi/v1.0/{path}", headers
+    prediction_environment = deployment.prediction_environment or {}
+    if prediction_environment.get("platform") == "datarobotServerless":
+        # Serverless predictions are served by the public API and expect a bearer token
+        headers["Authorization"] = f"Bearer {client.token}"
+        return f"{client.endpoint}/{path}", headers
+    raise ValueError(
+        "Can't make prediction request because Deployment object doesn't contain "
+        "default prediction server"
+    )
+
+
+class UploadStats:
+    """Thread-safe totals of the prediction request payloads sent."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.csv_bytes = 0
+        self.sent_bytes = 0
+
+    def record(self, payload: PredictionPayload) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += payload.rows
+            self.csv_bytes += payload.csv_bytes
+            self.sent_bytes += len(payload.content)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rows": self.rows,
+                "csv_bytes": self.csv_bytes,
+                "sent_bytes": self.sent_bytes,
+            }
+
+
+class PredictionPayload:
+    """Scoring rows encoded as the body of a prediction request."""
+
+    def __init__(self, df: pd.DataFrame, settings: PredictionSettings) -> None:
+        csv: bytes = df.to_csv(index=False).encode()
+        # The limit applies to the data the prediction server decompresses
+        if len(csv) > REQUEST_LIMIT_BYTES:
+            raise ValueError(
+                "DataFrame converted to csv exceeds 50MB request limit. "
+                f"DataFrame size: {len(csv)} bytes"
+            )
+        self.rows = len(df)
+        self.csv_bytes = len(csv)
+        self.headers = {"Content-Type": "text/csv", "Accept": "text/csv"}
+        if settings.upload_compression == "gzip":
+            self.content = gzip.compress(
+                csv, compresslevel=settings.upload_compression_level, mtime=0
+            )
+            self.headers["Content-Encoding"] = "gzip"
+        else:
+            self.content = csv
+
+    def log_sent(self, url: str) -> None:
+        logger.debug(
+            "Sent %d scoring rows to %s: %d bytes (%d bytes of CSV)",
+            self.rows,
+            url,
+            len(self.content),
+            self.csv_bytes,
+        )
+
+
+def _decode_csv(content: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(content))
+
+
+def _retry_delay(attempt: int, status_code: int) -> float:
+    """Backoff before retrying a prediction request that failed with a gateway error."""
+    logger.debug(
+        "Request got %d. Retrying failed request %d/%d",
+        status_code,
+        attempt + 1,
+        REQUEST_MAX_RETRY,
+    )
+    return float(min(REQUEST_RETRY_MAX_DELAY, REQUEST_RETRY_SLEEP * 2**attempt))
+
+
+def _get_prediction_params(
+    max_explanations: int, forecast_point: Optional[pd.Timestamp]
+) -> Dict[str, Any]:
+    """Query parameters of a prediction request."""
+    params: Dict[str, Any] = {"maxExplanations": max_explanations}
+    if forecast_point is not None:
+        params["forecastPoint"] = forecast_point.isoformat()
+    return params
+
+
+def predict(
+    deployment: dr.Deployment,
+    data_frame: pd.DataFrame,
+    max_explanations: int,
+    settings: PredictionSettings,
+    upload_stats: UploadStats,
+    forecast_point: Optional[pd.Timestamp] = None,
+) -> PredictionResult:
+    """
+    Forecast with a deployment like `datarobot_predict.deployment.predict`.
+
+    Sends the same request through the DataRobot client's session, with the
+    same retries of serverless gateway errors, but compresses the scoring rows
+    as configured in ``settings`` and records the bytes sent in
+    ``upload_stats``. When given, ``forecast_point`` is sent as the request's
+    forecast point instead of letting DataRobot infer it from the rows, so
+    shards of one frame are all forecast from the same point.
+
+    Returns
+    -------
+    PredictionResult
+        Predictions as returned by the deployment and the response headers.
+    """
+    url, headers = _get_prediction_request(deployment)
+    payload = PredictionPayload(data_frame, settings)
+    headers.update(payload.headers)
+    client = dr.client.get_client()
+    for attempt in range(REQUEST_MAX_RETRY):
+        upload_stats.record(payload)
+        try:
+            response = client.request(
+                "POST",
+                url,
+                params=_get_prediction_params(max_explanations, forecast_point),
+                data=payload.content,
+                headers=headers,
+                timeout=PREDICTION_TIMEOUT_SECONDS,
+            )
+            break
+        except ServerError as e:
+            if (
+                e.status_code not in REQUEST_RETRYABLE_STATUS_CODES
+                or attempt == REQUEST_MAX_RETRY - 1
+            ):
+                raise
+            time.sleep(_retry_delay(attempt, e.status_code))
+    payload.log_sent(url)
+    return PredictionResult(_decode_csv(response.content), response.headers)
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    """Raise the DataRobot client's exception for an unsuccessful response."""
+    if response.is_success:
+        return
+    status_code = response.status_code
+    if status_code == 401:
+        message = (
+            "The server is saying you are not properly authenticated. "
+            "Please make sure your API token is valid."
+        )
+    elif response.headers.get("content-type") == "application/json":
+        message = response.json()
+    else:
+        message = response.content.decode("ascii", errors="replace")[:79]
+    if 400 <= status_code < 500:
+        try:
+            parsed_json = response.json()
+        except ValueError:
+            parsed_json = {}
+        raise ClientError(
+            f"{status_code} client error: {message}", status_code, json=parsed_json
+        )
+    raise ServerError(f"{status_code} server error: {message}", status_code)
+
+
+async def predict_async(
+    client: httpx.AsyncClient,
+    deployment: dr.Deployment,
+    df: pd.DataFrame,
+    max_explanations: int,
+    settings: PredictionSettings,
+    upload_stats: UploadStats,
+    forecast_point: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Async variant of `predict`.
+
+    Sends the same request without blocking the event loop, verifying TLS
+    like the DataRobot client and raising the same `ClientError` and
+    `ServerError` for failed requests. Encoding and parsing run in a worker
+    thread.
+
+    Returns
+    -------
+    pd.DataFrame
+        Predictions as returned by the deployment.
+    """
+    url, headers = _get_prediction_request(deployment)
+    payload = await asyncio.to_thread(PredictionPayload, df, settings)
+    headers.update(payload.headers)
+    for attempt in range(REQUEST_MAX_RETRY):
+        upload_stats.record(payload)
+        response = await client.post(
+            url,
+            params=_get_prediction_params(max_explanations, forecast_point),
+            headers=headers,
+            content=payload.content,
+        )
+        if (
+            response.status_code not in REQUEST_RETRYABLE_STATUS_CODES
+            or attempt == REQUEST_MAX_RETRY - 1
+        ):
+            break
+        await asyncio.sleep(_retry_delay(attempt, response.status_code))
+    _raise_for_status(response)
+    payload.log_sent(url)
+    return await asyncio.to_thread(_decode_csv, response.content)
@@ -13,33 +13,199 @@
 # limitations under the License.
 from __future__ import annotations
 
+import base64
+import binascii
+import contextlib
+import hashlib
+import json
 import sys
 from http import HTTPStatus
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+import pandas as pd
+import pyarrow as pa
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 
 sys.path.append("..")
 
 from forecastic.api import (
     LLMNotAvailableException,
     get_app_settings,
-    get_filters,
-    get_formatted_predictions,
-    get_llm_summary,
-    get_runtime_attributes,
-    get_scoring_data,
-    share_access,
+    get_filters_async,
+    get_formatted_predictions_frame_async,
+    get_llm_summary_async,
+    get_rollup_forecast_async,
+    get_runtime_attributes_async,
+    get_versioned_scoring_data_frame_async,
+    share_access_async,
 )
+from forecastic.predictions import close_async_http_client
 from forecastic.schema import (
     AppRuntimeAttributes,
     AppSettings,
     FilterSpec,
     ForecastSummary,
     MultiSelectFilter,
+    PredictionRow,
 )
 
-app = FastAPI()
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Close the pooled async HTTP client when the app shuts down."""
+    yield
+    await close_async_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
+
+RECORDS_MEDIA_TYPE = "application/json"
+COLUMNS_MEDIA_TYPE = "application/vnd.forecastic.columns+json"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_CHUNK_SIZE = 1000
+
+# Nested JSON conveniences that duplicate flat prediction columns; not sent as Arrow
+NESTED_PREDICTION_COLUMNS = ["predictionIntervals", "predictionExplanations"]
+
+tabular_responses: dict[int | str, dict[str, Any]] = {
+    HTTPStatus.OK.value: {
+        "content": {
+            COLUMNS_MEDIA_TYPE: {"schema": {"type": "object"}},
+            ARROW_STREAM_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        }
+    }
+}
+
+scoring_data_responses: dict[int | str, dict[str, Any]] = {
+    HTTPStatus.OK.value: {
+        "content": {
+            **tabular_responses[HTTPStatus.OK.value]["content"],
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+        },
+        "headers": {
+            NEXT_CURSOR_HEADER: {
+                "description": "Cursor of the next page, absent on the last page",
+                "schema": {"type": "string"},
+            }
+        },
+    },
+    HTTPStatus.CONFLICT.value: {
+        "description": "Scoring data was refreshed since the cursor was issued"
+    },
+}
+
+
+def _negotiate_media_type(
+    accept: Optional[str],
+    supported_media_types: Tuple[str, ...] = (
+        COLUMNS_MEDIA_TYPE,
+        ARROW_STREAM_MEDIA_TYPE,
+        RECORDS_MEDIA_TYPE,
+    ),
+) -> str:
+    """Pick the preferred supported media type from an Accept header."""
+    candidates = []
+    for position, media_range in enumerate((accept or "").split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0 and media_type in supported_media_types:
+            candidates.append((-quality, position, media_type))
+    return min(candidates)[2] if candidates else RECORDS_MEDIA_TYPE
+
+
+def _tabular_response(
+    df: pd.DataFrame, media_type: str, drop_columns: Optional[List[str]] = None
+) -> Response:
+    """Serialize a DataFrame column-wise as JSON or as an Arrow IPC stream."""
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        table = pa.Table.from_pandas(
+            df.drop(columns=drop_columns or [], errors="ignore"), preserve_index=False
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue().to_pybytes(), media_type=media_type)
+    columns = {str(column): df[column].tolist() for column in df.columns}
+    return Response(
+        content=to_json(columns, inf_nan_mode="null"), media_type=media_type
+    )
+
+
+def _get_query_digest(
+    filter_selection: Optional[List[FilterSpec]], display_history_length: Optional[int]
+) -> str:
+    """Digest of the query parameters that determine the rows being paged."""
+    return hashlib.sha256(
+        to_json([filter_selection, display_history_length])
+    ).hexdigest()[:16]
+
+
+def _encode_cursor(version_id: str, query_digest: str, offset: int) -> str:
+    cursor = {"version": version_id, "query": query_digest, "offset": offset}
+    return base64.urlsafe_b64encode(to_json(cursor)).decode()
+
+
+def _decode_cursor(cursor: str, version_id: str, query_digest: str) -> int:
+    """
+    Offset of a cursor issued for the same query on the same scoring data.
+
+    A cursor issued before the scoring data was refreshed would skip or repeat
+    rows, so it is rejected with 409 and paging has to start over.
+    """
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        offset = int(decoded["offset"])
+        valid = offset >= 0 and decoded["query"] == query_digest
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="Invalid pagination cursor"
+        )
+    if decoded["version"] != version_id:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail="Scoring data changed since the cursor was issued, "
+            "restart pagination without a cursor",
+        )
+    return offset
+
+
+def _paginate(
+    df: pd.DataFrame,
+    cursor: Optional[str],
+    limit: Optional[int],
+    version_id: str,
+    query_digest: str,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Slice one page out of a DataFrame and return the cursor of the next page."""
+    start = 0 if cursor is None else _decode_cursor(cursor, version_id, query_digest)
+    stop = len(df) if limit is None else start + limit
+    next_cursor = (
+        _encode_cursor(version_id, query_digest, stop) if stop < len(df) else None
+    )
+    return df.iloc[start:stop], next_cursor
+
+
+def _iter_ndjson(df: pd.DataFrame, chunk_size: int) -> Iterator[bytes]:
+    """Serialize a DataFrame as newline delimited JSON, one chunk of rows at a time."""
+    for start in range(0, len(df), chunk_size):
+        records = df.iloc[start : start + chunk_size].to_dict(orient="records")
+        yield b"".join(
+            to_json(record, inf_nan_mode="null") + b"\n" for record in records
+        )
 
 
 @app.get("/appSettings")
@@ -49,26 +215,87 @@ async def get_app_settings_endpoint() -> AppSettings:
 
 @app.get("/runtimeAttributes")
 async def get_runtime_attributes_endpoint() -> AppRuntimeAttributes:
-    return get_runtime_attributes()
+    return await get_runtime_attributes_async()
 
 
 @app.get("/filters")
-async def get_filters_endpoint() -> List[MultiSelectFilter]:
-    return get_filters()
+async def get_filters_endpoint(
+    filter_selection: Optional[List[FilterSpec]] = None,
+) -> List[MultiSelectFilter]:
+    return await get_filters_async(filter_selection)
 
 
-@app.get("/scoringData")
+@app.get(
+    "/scoringData",
+    response_model=list[dict[str, Any]],
+    responses=scoring_data_responses,
+)
 async def get_scoring_data_endpoint(
+    response: Response,
     filter_selection: Optional[List[FilterSpec]] = None,
-) -> list[dict[str, Any]]:
-    return get_scoring_data(filter_selection)
+    display_history_length: Optional[int] = Query(default=None, gt=0),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, gt=0),
+    accept: Optional[str] = Header(default=None),
+) -> Any:
+    version_id, df = await get_versioned_scoring_data_frame_async(
+        filter_selection, display_history_length
+    )
+    headers = {}
+    if cursor is not None or limit is not None:
+        df, next_cursor = _paginate(
+            df,
+            cursor,
+            limit,
+            version_id,
+            _get_query_digest(filter_selection, display_history_length),
+        )
+        if next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+    media_type = _negotiate_media_type(
+        accept,
+        (
+            NDJSON_MEDIA_TYPE,
+            COLUMNS_MEDIA_TYPE,
+            ARROW_STREAM_MEDIA_TYPE,
+            RECORDS_MEDIA_TYPE,
+        ),
+    )
+    if media_type == NDJSON_MEDIA_TYPE:
+        return StreamingResponse(
+            _iter_ndjson(df, NDJSON_CHUNK_SIZE), media_type=media_type, headers=headers
+        )
+    if media_type == RECORDS_MEDIA_TYPE:
+        response.headers.update(headers)
+        return df.to_dict(orient="records")
+    tabular_response = _tabular_response(df, media_type)
+    tabular_response.headers.update(headers)
+    return tabular_response
 
 
-@app.post("/predictions")
+@app.post(
+    "/predictions",
+    response_model=list[dict[str, Any]],
+    responses=tabular_responses,
+)
 async def get_predictions_endpoint(
     scoring_data: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
-    return get_formatted_predictions(scoring_data)
+    explanations: bool = True,
+    accept: Optional[str] = Header(default=None),
+) -> Any:
+    df = await get_formatted_predictions_frame_async(scoring_data, explanations)
+    media_type = _negotiate_media_type(accept)
+    if media_type == RECORDS_MEDIA_TYPE:
+        return df.to_dict(orient="records")
+    return _tabular_response(df, media_type, drop_columns=NESTED_PREDICTION_COLUMNS)
+
+
+@app.post("/rollupForecast")
+async def get_rollup_forecast_endpoint(
+    filter_selection: Optional[List[FilterSpec]] = None,
+) -> List[PredictionRow]:
+    forecast = await get_rollup_forecast_async(filter_selection)
+    return forecast.to_rows()
 
 
 @app.post("/llmSummary")
@@ -76,7 +303,7 @@ async def get_llm_summary_endpoint(
     predictions: List[dict[str, Any]],
 ) -> ForecastSummary:
     try:
-        return get_llm_summary(predictions)
+        return await get_llm_summary_async(predictions)
     except LLMNotAvailableException:
         raise HTTPException(
             status_code=HTTPStatus.SERVICE_UNAVAILABLE,
@@ -86,4 +313,4 @@ async def get_llm_summary_endpoint(
 
 @app.patch("/share")
 async def share_endpoint(emails: List[str]) -> None:
-    share_access(emails)
+    await share_access_async(emails)
@@ -16,7 +16,10 @@ from __future__ import annotations
 from typing import Any, cast
 
 import datarobot as dr
-from pydantic import BaseModel, ConfigDict, Field
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class FeatureSettingConfig(BaseModel):
@@ -221,6 +224,73 @@ class PredictionRow(BaseModel):
     high: float
 
 
+class PredictionFrame(BaseModel):
+    """
+    Standardized forecast stored column-wise, one entry per date.
+
+    Columns are validated once as whole arrays instead of row by row.
+    `to_frame` wraps them in a DataFrame without copying and `to_rows` returns
+    the equivalent `PredictionRow`s.
+    """
+
+    date_id: npt.NDArray[np.object_]
+    prediction: npt.NDArray[np.float64]
+    low: npt.NDArray[np.float64]
+    high: npt.NDArray[np.float64]
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    @field_validator("date_id", mode="before")
+    @classmethod
+    def _validate_date_id(cls, value: Any) -> npt.NDArray[np.object_]:
+        date_id: npt.NDArray[np.object_] = np.asarray(value, dtype=object)
+        if len(date_id) > 0 and pd.api.types.infer_dtype(date_id) != "string":
+            raise ValueError("date_id must contain strings")
+        return date_id
+
+    @field_validator("prediction", "low", "high", mode="before")
+    @classmethod
+    def _validate_values(cls, value: Any) -> npt.NDArray[np.float64]:
+        return np.asarray(value, dtype=np.float64)
+
+    @model_validator(mode="after")
+    def _validate_lengths(self) -> PredictionFrame:
+        if (
+            not len(self.date_id)
+            == len(self.prediction)
+            == len(self.low)
+            == len(self.high)
+        ):
+            raise ValueError("Columns must have the same length")
+        return self
+
+    def __len__(self) -> int:
+        return len(self.date_id)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "date_id": self.date_id,
+                "prediction": self.prediction,
+                "low": self.low,
+                "high": self.high,
+            },
+            copy=False,
+        )
+
+    def to_rows(self) -> list[PredictionRow]:
+        return [
+            PredictionRow.model_construct(
+                date_id=date_id, prediction=prediction, low=low, high=high
+            )
+            for date_id, prediction, low, high in zip(
+                self.date_id.tolist(),
+                self.prediction.tolist(),
+                self.low.tolist(),
+                self.high.tolist(),
+            )
+        ]
+
+
 class ExplanationRow(BaseModel):
     feature_name: str
     relative_importance: float
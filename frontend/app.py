@@ -22,15 +22,11 @@ from streamlit_theme import st_theme
 sys.path.append("..")
 
 from forecastic.api import (
+    ForecastResult,
     LLMNotAvailableException,
     get_app_settings,
-    get_explain_df,
     get_filters,
-    get_forecast_as_plotly_json,
-    get_llm_summary,
-    get_predictions,
     get_scoring_data,
-    get_standardized_predictions,
 )
 from forecastic.i18n import gettext
 from forecastic.schema import FilterSpec
@@ -80,7 +76,7 @@ def set_title() -> None:
 
 def fpa() -> None:
     set_title()
-    chartContainer = st.container()
+    chartContainer = st.container().empty()
     explanationContainer = st.container()
 
     if "filters" not in st.session_state:
@@ -117,23 +113,31 @@ def fpa() -> None:
                     FilterSpec(column=column_name, selected_values=widget_value)
                 )
             try:
-                scoring_data = get_scoring_data(filter_selection=series_selections)
+                scoring_data = get_scoring_data(
+                    filter_selection=series_selections,
+                    display_history_length=n_historical_records_to_display,
+                )
                 st.session_state["scoring_data"] = scoring_data
             except ValueError as e:
                 st.error(str(e))
                 st.stop()
-            forecast_raw = get_predictions(scoring_data)
-            forecast_processed = get_standardized_predictions(scoring_data)
+            forecast = ForecastResult(scoring_data)
 
-            st.session_state["forecast_processed"] = forecast_processed
+            st.session_state["forecast_processed"] = forecast.standardized_predictions
 
-            st.session_state["chart_json"] = get_forecast_as_plotly_json(
-                scoring_data, n_historical_records_to_display
+            st.session_state["chart_json"] = forecast.get_chart(
+                n_historical_records_to_display
             )
+        # Show the chart while explanations are still being computed
+        chartContainer.plotly_chart(
+            go.Figure(st.session_state["chart_json"]),
+            config=CHART_CONFIG,
+            use_container_width=True,
+        )
 
         with st.spinner(gettext("Generating explanation...")):
             try:
-                forecast_summary = get_llm_summary(forecast_raw)
+                forecast_summary = forecast.get_llm_summary()
                 st.session_state["headline"] = forecast_summary.headline
                 st.session_state["forecast_interpretation"] = (
                     forecast_summary.summary_body
@@ -141,9 +145,9 @@ def fpa() -> None:
 
             except LLMNotAvailableException:
                 pass
-        st.session_state["explanations_df"] = clean_column_headers(
-            get_explain_df(forecast_raw)
-        )
+            st.session_state["explanations_df"] = clean_column_headers(
+                forecast.explain_df
+            )
 
     if "chart_json" in st.session_state:
         chartContainer.plotly_chart(
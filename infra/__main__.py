@@ -152,6 +152,8 @@ if FORECAST_DEPLOYMENT_ID is None:
         output_settings=datarobot.BatchPredictionJobDefinitionOutputSettingsArgs(
             type="localFile"
         ),
+        # Match the explanations requested by the app so its output can be served
+        max_explanations=3,
         schedule=settings_forecast_deployment.batch_prediction_job_schedule,
     )
 
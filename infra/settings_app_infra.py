@@ -85,6 +85,12 @@ def get_app_files(
         (str(forecastic_path / "__init__.py"), "forecastic/__init__.py"),
         (str(forecastic_path / "schema.py"), "forecastic/schema.py"),
         (str(forecastic_path / "api.py"), "forecastic/api.py"),
+        (str(forecastic_path / "cache.py"), "forecastic/cache.py"),
+        (str(forecastic_path / "datasets.py"), "forecastic/datasets.py"),
+        (str(forecastic_path / "forecast_store.py"), "forecastic/forecast_store.py"),
+        (str(forecastic_path / "frames.py"), "forecastic/frames.py"),
+        (str(forecastic_path / "index.py"), "forecastic/index.py"),
+        (str(forecastic_path / "predictions.py"), "forecastic/predictions.py"),
         (str(forecastic_path / "resources.py"), "forecastic/resources.py"),
         (str(forecastic_path / "credentials.py"), "forecastic/credentials.py"),
         (str(forecastic_path / "i18n.py"), "forecastic/i18n.py"),
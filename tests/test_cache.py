@@ -0,0 +1,72 @@
+# Copyright 2024 DataRobot, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from forecastic.cache import SingleFlight
+
+
+def test_run_async_owner_cancellation_lets_waiters_compute() -> None:
+    async def scenario() -> None:
+        flight: SingleFlight[int] = SingleFlight()
+        started = asyncio.Event()
+        calls: List[List[str]] = []
+
+        async def compute(keys: List[str]) -> Dict[str, int]:
+            calls.append(keys)
+            if len(calls) == 1:
+                started.set()
+                await asyncio.Event().wait()
+            return {key: len(key) for key in keys}
+
+        owner = asyncio.create_task(flight.run_async(["a", "bb"], compute))
+        await started.wait()
+        waiter = asyncio.create_task(flight.run_async(["bb", "ccc"], compute))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        assert await waiter == {"bb": 2, "ccc": 3}
+        assert calls == [["a", "bb"], ["ccc"], ["bb"]]
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_run_async_owner_error_is_shared_with_waiters() -> None:
+    async def scenario() -> None:
+        flight: SingleFlight[int] = SingleFlight()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def compute(keys: List[str]) -> Dict[str, int]:
+            started.set()
+            await release.wait()
+            raise ValueError("failed")
+
+        owner = asyncio.create_task(flight.run_async(["a"], compute))
+        await started.wait()
+        waiter = asyncio.create_task(flight.run_async(["a"], compute))
+        await asyncio.sleep(0)
+        release.set()
+
+        for task in (owner, waiter):
+            with pytest.raises(ValueError, match="failed"):
+                await task
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())